@@ -0,0 +1,260 @@
+"""Engine analitik kolumnar untuk halaman "Analitik".
+
+Data tiket disimpan sebagai DataFrame bertipe: status, prioritas, kategori,
+dan departemen sebagai categorical, created_at/updated_at sebagai datetime64.
+Frame dibangun sekali lalu diperbarui hanya dengan baris yang baru/berubah
+(lewat repo.changes_since), dan hasil agregasi di-cache sampai data berubah.
+
+Analitik waktu (first response, time-in-status, waktu resolusi) dihitung
+secara vektor dari tabel event riwayat tiket (lihat events.py), yang juga
+hanya ditambah dengan event baru lewat repo.events_since.
+"""
+
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from events import EVENT_COMMENT, EVENT_CREATED, EVENT_FIELDS, EVENT_STATUS
+from models import (
+    CATEGORIES, DEPARTMENTS, PRIORITIES, STATUSES, TIMESTAMP_FORMAT, VOCABULARIES, Ticket
+)
+from profiler import span
+
+CATEGORICAL_COLUMNS = {
+    'status': STATUSES,
+    'priority': PRIORITIES,
+    'category': CATEGORIES,
+    'department': DEPARTMENTS,
+}
+DATETIME_COLUMNS = ['created_at', 'updated_at']
+FRAME_COLUMNS = list(CATEGORICAL_COLUMNS) + DATETIME_COLUMNS + ['name']
+EVENT_CATEGORICAL_COLUMNS = ['type', 'from_status', 'to_status']
+
+RESOLVED_STATUSES = ['Resolved', 'Closed']
+
+
+def _codes_column(tickets, field):
+    # Kode Vocabulary langsung menjadi kode Categorical; nilai kosong -> -1
+    values = list(VOCABULARIES[field].values)
+    codes = [getattr(t, field, -1) for t in tickets]
+    if None in values:
+        none_code = values.index(None)
+        codes = [-1 if code == none_code else code for code in codes]
+        values[none_code] = object()
+    return pd.Categorical.from_codes(codes, categories=values).remove_unused_categories()
+
+
+def _ticket_frame(tickets):
+    """Jalur cepat to_frame() untuk models.Ticket: tanpa parsing string"""
+    data = {field: _codes_column(tickets, field) for field in CATEGORICAL_COLUMNS}
+    for column in DATETIME_COLUMNS:
+        epochs = [getattr(t, column, None) for t in tickets]
+        epochs = [value if value.__class__ is int else None for value in epochs]
+        data[column] = pd.to_datetime(pd.array(epochs, dtype='Int64'), unit='s').astype('datetime64[ns]')
+    data['name'] = [t.get('name') for t in tickets]
+    frame = pd.DataFrame(data, index=pd.Index([t['id'] for t in tickets], name='id'))
+    for column, categories in CATEGORICAL_COLUMNS.items():
+        # Urutan kategori sama dengan jalur dict: daftar standar lalu nilai lain terurut
+        present = frame[column].cat.categories
+        extra = sorted(set(present) - set(categories))
+        frame[column] = frame[column].cat.set_categories(categories + extra)
+    return frame
+
+
+def to_frame(tickets):
+    """List tiket (dict atau models.Ticket) -> DataFrame bertipe dengan index ID tiket"""
+    if tickets and all(t.__class__ is Ticket for t in tickets):
+        return _ticket_frame(tickets)
+    data = {column: [t.get(column) for t in tickets] for column in FRAME_COLUMNS}
+    frame = pd.DataFrame(data, index=pd.Index([t['id'] for t in tickets], name='id'))
+    for column, categories in CATEGORICAL_COLUMNS.items():
+        # Nilai di luar daftar standar (misal dari data import) tetap dipertahankan
+        extra = sorted(set(frame[column].dropna()) - set(categories))
+        frame[column] = pd.Categorical(frame[column], categories=categories + extra)
+    for column in DATETIME_COLUMNS:
+        frame[column] = pd.to_datetime(frame[column], format=TIMESTAMP_FORMAT, errors='coerce')
+    return frame
+
+
+def events_to_frame(events):
+    """List event (dict) -> DataFrame bertipe"""
+    frame = pd.DataFrame({field: [e.get(field) for e in events] for field in EVENT_FIELDS})
+    frame['at'] = pd.to_datetime(frame['at'], format=TIMESTAMP_FORMAT, errors='coerce')
+    for column in EVENT_CATEGORICAL_COLUMNS:
+        frame[column] = frame[column].astype('category')
+    return frame
+
+
+def _hours(delta):
+    return delta.dt.total_seconds() / 3600
+
+
+def _align_categories(frame, delta, columns=CATEGORICAL_COLUMNS):
+    """Menyamakan kategori frame dan delta agar concat tetap categorical"""
+    for column in columns:
+        categories = frame[column].cat.categories.union(delta[column].cat.categories, sort=False)
+        if not categories.equals(frame[column].cat.categories):
+            frame[column] = frame[column].cat.set_categories(categories)
+        delta[column] = delta[column].cat.set_categories(categories)
+
+
+class TicketAnalytics:
+    """Frame kolumnar + cache agregasi yang mengikuti perubahan repository"""
+
+    def __init__(self, repo):
+        self.repo = repo
+        # RLock: agregasi turunan (misal persentil) memanggil agregasi lain
+        self._lock = threading.RLock()
+        self._frame = None
+        self._position = 0
+        self._events = None
+        self._event_position = 0
+        self._cache = {}
+
+    def refresh(self):
+        """Menerapkan perubahan sejak refresh terakhir; mengembalikan frame terbaru"""
+        with self._lock:
+            self._refresh_events()
+            if self._frame is None:
+                self._rebuild()
+                return self._frame
+            changed, position = self.repo.changes_since(self._position)
+            if changed is None:
+                self._rebuild()
+            elif changed:
+                with span("analytics_frame_update"):
+                    self._apply(list(dict.fromkeys(changed)))
+                self._position = position
+            return self._frame
+
+    def _refresh_events(self):
+        new_events, position = self.repo.events_since(self._event_position)
+        self._event_position = position
+        if not new_events and self._events is not None:
+            return
+        delta = events_to_frame(new_events)
+        if self._events is None or not len(self._events):
+            self._events = delta
+        elif len(delta):
+            # Kategori disamakan dulu: kolom yang seluruhnya NA di delta (misal
+            # from_status untuk komentar) tidak mengubah dtype hasil concat
+            _align_categories(self._events, delta, EVENT_CATEGORICAL_COLUMNS)
+            self._events = pd.concat([self._events, delta], ignore_index=True)
+        self._cache = {}
+
+    def memory_structures(self):
+        """Frame dan cache agregasi, untuk profiler.measure_memory()"""
+        return {'analytics_frame': self._frame, 'analytics_events': self._events, 'analytics_cache': self._cache}
+
+    def events(self):
+        """Tabel event riwayat tiket (ticket_id, at, type, from_status, to_status, author)"""
+        self.refresh()
+        return self._events
+
+    def _rebuild(self):
+        _, self._position = self.repo.changes_since(0)
+        with span("analytics_frame_build"):
+            self._frame = to_frame(self.repo.all())
+        self._cache = {}
+
+    def _apply(self, ticket_ids):
+        delta = to_frame(self.repo.get_many(ticket_ids))
+        frame = self._frame
+        _align_categories(frame, delta)
+        existing = delta.index.intersection(frame.index)
+        if len(existing):
+            frame.loc[existing, FRAME_COLUMNS] = delta.loc[existing, FRAME_COLUMNS]
+        new_rows = delta.loc[delta.index.difference(frame.index, sort=False)]
+        if len(new_rows):
+            frame = pd.concat([frame, new_rows])
+        self._frame = frame
+        self._cache = {}
+
+    def _cached(self, name, compute):
+        self.refresh()
+        with self._lock:
+            if name not in self._cache:
+                # Kunci bisa berupa (nama, parameter); span cukup memakai namanya
+                with span(f"aggregate_{name[0] if isinstance(name, tuple) else name}"):
+                    self._cache[name] = compute(self._frame)
+            return self._cache[name]
+
+    def daily_volume(self):
+        """Jumlah tiket yang dibuat per hari"""
+        return self._cached(
+            'daily_volume',
+            lambda frame: frame.groupby(frame['created_at'].dt.normalize()).size()
+        )
+
+    def resolution_hours(self):
+        """Waktu resolusi (jam) per tiket yang sekarang Resolved/Closed.
+
+        Diukur dari created_at sampai perpindahan terakhir ke Resolved/Closed,
+        sehingga komentar setelah tiket selesai tidak mengubah hasilnya.
+        """
+        def compute(frame):
+            events = self._events
+            resolving = events[
+                (events['type'] == EVENT_STATUS)
+                & events['to_status'].isin(RESOLVED_STATUSES)
+                & ~events['from_status'].isin(RESOLVED_STATUSES)
+            ]
+            resolved_at = resolving.groupby('ticket_id', observed=True)['at'].max()
+            resolved_ids = frame.index[frame['status'].isin(RESOLVED_STATUSES)]
+            resolved_at = resolved_at[resolved_at.index.isin(resolved_ids)]
+            return _hours(resolved_at - frame.loc[resolved_at.index, 'created_at'])
+        return self._cached('resolution_hours', compute)
+
+    def resolution_percentiles(self, quantiles=(0.5, 0.9, 0.99)):
+        """Persentil waktu resolusi (jam), default p50/p90/p99"""
+        return self._cached(
+            ('resolution_percentiles', quantiles),
+            lambda frame: self.resolution_hours().quantile(list(quantiles))
+        )
+
+    def time_to_first_response(self):
+        """Jam dari pembuatan tiket sampai respons pertama dari tim support.
+
+        Respons = perubahan status, atau komentar dari selain pembuat tiket.
+        Tiket yang belum direspons tidak disertakan.
+        """
+        def compute(frame):
+            events = self._events
+            events = events[events['type'].isin([EVENT_STATUS, EVENT_COMMENT])]
+            requester = frame['name'].reindex(events['ticket_id']).to_numpy()
+            responses = events[(events['type'] == EVENT_STATUS) | (events['author'].to_numpy() != requester)]
+            first_at = responses.groupby('ticket_id', observed=True)['at'].min()
+            first_at = first_at[first_at.index.isin(frame.index)]
+            return _hours(first_at - frame.loc[first_at.index, 'created_at'])
+        return self._cached('time_to_first_response', compute)
+
+    def time_in_status(self):
+        """Total jam setiap tiket berada di tiap status (baris = tiket, kolom = status).
+
+        Status terakhir dihitung sampai waktu sekarang, kecuali status selesai
+        (RESOLVED_STATUSES) yang tidak lagi menunggu apa pun.
+        """
+        def compute(frame):
+            # Yang di-cache hanya interval yang sudah selesai dan awal status
+            # terakhir; interval yang masih berjalan dihitung saat dibaca
+            events = self._events
+            transitions = events[events['type'].isin([EVENT_CREATED, EVENT_STATUS])]
+            transitions = transitions.sort_values(['ticket_id', 'at'], kind='stable')
+            next_at = transitions.groupby('ticket_id', observed=True)['at'].shift(-1)
+            closed = next_at.notna()
+            durations = _hours(next_at[closed] - transitions['at'][closed])
+            finished = durations.groupby(
+                [transitions['ticket_id'][closed], transitions['to_status'][closed]], observed=True
+            ).sum()
+            current = transitions.loc[~closed, ['ticket_id', 'to_status', 'at']]
+            current = current[~current['to_status'].isin(RESOLVED_STATUSES)]
+            return finished, current
+        finished, current = self._cached('time_in_status', compute)
+        ongoing = _hours(pd.Timestamp(datetime.now()) - current['at'])
+        ongoing.index = pd.MultiIndex.from_arrays([current['ticket_id'], current['to_status']])
+        # concat dengan Series kosong memicu FutureWarning pandas
+        totals = pd.concat([finished, ongoing]) if len(finished) and len(ongoing) else (
+            finished if len(finished) else ongoing
+        )
+        return totals.groupby(level=[0, 1], observed=True).sum().unstack(fill_value=0.0)
@@ -0,0 +1,151 @@
+"""Penyimpanan lampiran tiket berbasis hash konten (content-addressed).
+
+File upload disalin ke disk per potongan sambil dihitung SHA-256-nya, lalu
+disimpan sebagai ATTACHMENTS_DIR/<2 karakter awal hash>/<hash>. File dengan
+isi yang sama hanya disimpan sekali. Tiket hanya menyimpan referensinya
+(lihat store_upload), sehingga file tiket tidak membesar.
+
+Unduhan dibaca lewat memory map, dan thumbnail gambar dibuat sekali lalu
+di-cache di ATTACHMENTS_DIR/thumbs.
+"""
+
+import hashlib
+import mimetypes
+import mmap
+import os
+import re
+import tempfile
+
+ATTACHMENTS_DIR = "attachments"
+THUMBNAILS_DIR = os.path.join(ATTACHMENTS_DIR, "thumbs")
+
+ATTACHMENT_TYPES = ['png', 'jpg', 'jpeg', 'pdf', 'docx']
+IMAGE_TYPES = ['png', 'jpg', 'jpeg']
+
+# Ukuran maksimum satu lampiran (bytes)
+MAX_ATTACHMENT_SIZE = 10 * 1024 * 1024
+
+# Ukuran potongan saat menyalin upload ke disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Sisi terpanjang thumbnail (pixel)
+THUMBNAIL_SIZE = 240
+
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class AttachmentError(ValueError):
+    """Lampiran ditolak (tipe tidak didukung atau terlalu besar)"""
+
+
+def _extension(filename):
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+
+def blob_path(sha256):
+    """Path file lampiran untuk hash SHA-256 (hex)"""
+    if not _SHA256_PATTERN.match(sha256 or ''):
+        raise ValueError(f"Hash lampiran tidak valid: {sha256!r}")
+    return os.path.join(ATTACHMENTS_DIR, sha256[:2], sha256)
+
+
+def format_size(size):
+    """Ukuran bytes -> teks singkat (misal "1.2 MB")"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def store_upload(fileobj, filename, max_size=MAX_ATTACHMENT_SIZE):
+    """Menyimpan file biner `fileobj` sebagai lampiran; mengembalikan referensinya.
+
+    Referensi berisi sha256, name, size, dan type (MIME). Melempar
+    AttachmentError jika tipe file tidak didukung atau ukurannya melebihi
+    `max_size`.
+    """
+    extension = _extension(filename)
+    if extension not in ATTACHMENT_TYPES:
+        raise AttachmentError(f"Tipe file .{extension} tidak didukung")
+    os.makedirs(ATTACHMENTS_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=ATTACHMENTS_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = fileobj.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise AttachmentError(
+                        f"{filename} melebihi batas ukuran lampiran ({format_size(max_size)})"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        sha256 = digest.hexdigest()
+        path = blob_path(sha256)
+        if os.path.exists(path):
+            # Isi yang sama sudah tersimpan: cukup referensinya
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {
+        'sha256': sha256,
+        'name': os.path.basename(filename),
+        'size': size,
+        'type': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+    }
+
+
+def read_attachment(sha256):
+    """Isi lampiran sebagai bytes, dibaca lewat memory map"""
+    with open(blob_path(sha256), 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:]
+
+
+def is_image(attachment):
+    return _extension(attachment['name']) in IMAGE_TYPES
+
+
+def thumbnail_path(attachment, size=THUMBNAIL_SIZE):
+    """Path thumbnail PNG untuk lampiran gambar (dibuat sekali), atau None"""
+    if not is_image(attachment):
+        return None
+    path = os.path.join(THUMBNAILS_DIR, f"{attachment['sha256']}_{size}.png")
+    if os.path.exists(path):
+        return path
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    source = blob_path(attachment['sha256'])
+    if not os.path.exists(source):
+        return None
+    os.makedirs(THUMBNAILS_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=THUMBNAILS_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f, Image.open(source) as image:
+            # JPEG besar didekode langsung di resolusi yang lebih kecil
+            image.draft('RGB', (size, size))
+            image.thumbnail((size, size))
+            image.save(f, format='PNG')
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # Gambar rusak atau terlalu besar: tampilkan tanpa thumbnail
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return path
@@ -0,0 +1,393 @@
+"""Benchmark jalur utama aplikasi pada dataset sintetis (lihat datagen.py).
+
+Untuk setiap backend, dataset dibuat di folder sementara lalu diukur:
+import, memuat repository, menyimpan snapshot (JSON), alokasi ID tiket,
+filter "Daftar Tiket", tiga mode "Cari Tiket", statistik Dashboard,
+agregasi Analitik, dan penulisan (buat tiket, update, komentar). Dengan
+--apptest, setiap halaman juga dijalankan lewat Streamlit AppTest.
+
+Hasil ditulis ke file JSON (waktu dalam milidetik) sehingga bisa
+dibandingkan antar versi; --compare menandai operasi yang melambat dari
+hasil sebelumnya dan keluar dengan kode 1.
+
+Contoh:
+    python benchmark.py --tickets 100000 --output hasil.json
+    python benchmark.py --tickets 10000 --backend json --apptest --compare hasil.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import storage
+from analytics import TicketAnalytics
+from datagen import generate
+from importer import IMPORT_BATCH_SIZE
+from models import CATEGORIES, PRIORITIES, TIMESTAMP_FORMAT
+from repository import creation_order_key, get_repository
+from ticket_index import format_ticket_id
+
+BACKENDS = ["sqlite", "json"]
+VIEWS = ["Dashboard", "Buat Tiket Baru", "Daftar Tiket", "Cari Tiket", "Analitik"]
+
+# Jumlah input berbeda untuk operasi yang diukur per panggilan (lookup, tulis)
+SAMPLE_SIZE = 200
+
+# Operasi dianggap regresi jika median-nya melebihi baseline sebesar faktor ini
+# dan selisihnya lebih dari REGRESSION_MIN_MS
+REGRESSION_FACTOR = 1.25
+REGRESSION_MIN_MS = 1.0
+
+KEYWORDS = ["login", "tagihan tidak sesuai", "aplikasi mobile lambat", "refund", "screenshot error"]
+EMAIL_DOMAINS = ["@gmail.com", "@kampus.ac.id"]
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def _stats(samples, **extra):
+    """Ringkasan durasi (detik) dalam milidetik"""
+    samples = sorted(samples)
+    return {
+        'runs': len(samples),
+        'min_ms': samples[0] * 1000,
+        'median_ms': statistics.median(samples) * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        'max_ms': samples[-1] * 1000,
+        **extra
+    }
+
+
+def timed(fn, repeat, after=None):
+    """Menjalankan fn() sebanyak `repeat` kali; `after(hasil)` dijalankan di luar pengukuran"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+        if after is not None:
+            after(result)
+    return _stats(samples)
+
+
+def timed_each(fn, inputs):
+    """Menjalankan fn(x) sekali untuk setiap input; statistik per panggilan"""
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        samples.append(time.perf_counter() - start)
+    return _stats(samples)
+
+
+class Benchmark:
+    """Hasil pengukuran satu backend, dicetak saat dijalankan"""
+
+    def __init__(self, backend, repeat):
+        self.backend = backend
+        self.repeat = repeat
+        self.results = {}
+        # Jumlah tiket setelah import, untuk memastikan backend yang dibandingkan berisi data sama
+        self.ticket_count = None
+
+    def record(self, name, stats):
+        self.results[name] = stats
+        print(f"  {name:<36} median {stats['median_ms']:>10.2f} ms   p95 {stats['p95_ms']:>10.2f} ms", flush=True)
+
+    def run(self, name, fn, repeat=None, after=None):
+        self.record(name, timed(fn, repeat or self.repeat, after))
+
+    def run_each(self, name, fn, inputs):
+        self.record(name, timed_each(fn, inputs))
+
+
+def _load_dataset(bench, repo, count, seed):
+    """Import dataset sintetis per batch (dengan riwayat event lengkap)"""
+    start = time.perf_counter()
+    tickets, events = [], []
+    for ticket, ticket_events in generate(count, seed):
+        tickets.append(ticket)
+        events.extend(ticket_events)
+        if len(tickets) >= IMPORT_BATCH_SIZE:
+            repo.import_tickets(tickets, events)
+            tickets, events = [], []
+    if tickets:
+        repo.import_tickets(tickets, events)
+    storage.wait_for_compaction()
+    seconds = time.perf_counter() - start
+    bench.ticket_count = repo.count()
+    bench.record('import', _stats([seconds], tickets_per_s=count / seconds if seconds else 0.0))
+
+
+def _new_ticket(rnd, ticket_id):
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    return {
+        'id': ticket_id, 'name': "Benchmark", 'email': f"bench{rnd.randint(1, 999)}@example.com",
+        'phone': '', 'category': 'Teknis', 'priority': 'Medium', 'department': 'IT Support',
+        'subject': "Tiket benchmark login", 'description': "Dibuat oleh benchmark.py",
+        'status': 'Open', 'created_at': now, 'updated_at': now, 'assigned_to': None
+    }
+
+
+def run_headless(bench, count, seed):
+    repo = get_repository()
+    try:
+        _measure_headless(bench, repo, count, seed)
+    finally:
+        repo.close()
+
+
+def _measure_headless(bench, repo, count, seed):
+    rnd = random.Random(seed)
+    _load_dataset(bench, repo, count, seed)
+
+    # Hanya waktu muat yang diukur; koneksi (dan checkpoint WAL) ditutup di luar pengukuran
+    bench.run('load_repository', get_repository, after=lambda loaded: loaded.close())
+    if bench.backend == 'json':
+        bench.run('load_tickets', storage.load_tickets)
+        bench.run('save_tickets', lambda: storage.save_tickets([dict(t) for t in repo.all()]))
+        # Snapshot baru memulai journal baru; muat ulang di luar pengukuran
+        repo.sync()
+    bench.run_each('allocate_ticket_id', lambda _: repo.allocate_ticket_id(), range(SAMPLE_SIZE))
+
+    # Daftar Tiket: filter default, halaman pertama dan halaman ke-20
+    statuses, priorities, categories = ["Open", "In Progress"], PRIORITIES, CATEGORIES
+    bench.run('filter_count', lambda: repo.count_filtered(statuses, priorities, categories))
+    bench.run('filter_first_page', lambda: repo.filter_page(statuses, priorities, categories, limit=26))
+
+    def deep_page():
+        cursor = None
+        for _ in range(20):
+            page = repo.filter_page(["Closed"], priorities, categories, cursor=cursor, limit=26)
+            if len(page) < 26:
+                break
+            cursor = creation_order_key(page[24])
+    bench.run('filter_page_20', deep_page)
+
+    # Cari Tiket
+    ids = [format_ticket_id(rnd.randint(1, count)) for _ in range(SAMPLE_SIZE)]
+    bench.run_each('search_id', repo.get, ids)
+    emails = [ticket['email'][:6] for ticket in repo.get_many(ids[:50])]
+    bench.run_each('search_email_prefix', repo.find_by_email, emails)
+    bench.run_each('search_email_domain', repo.find_by_email, EMAIL_DOMAINS * 5)
+    bench.run_each('search_keyword', lambda keyword: repo.search_keyword(keyword, limit=50), KEYWORDS * 10)
+
+    # Dashboard
+    def dashboard():
+        repo.count()
+        for field in ['status', 'priority', 'category', 'department']:
+            repo.count_by(field)
+        repo.recent(5)
+        repo.recent(5, 'status', 'Open')
+    bench.run('dashboard', dashboard)
+
+    # Analitik: dingin (frame dibangun dari awal) dan hangat (dari cache)
+    def analytics_cold():
+        analytics = TicketAnalytics(repo)
+        analytics.daily_volume()
+        analytics.resolution_percentiles()
+        analytics.time_to_first_response()
+        analytics.time_in_status()
+    bench.run('analytics_cold', analytics_cold)
+    analytics = TicketAnalytics(repo)
+    analytics.refresh()
+    for name in ['daily_volume', 'resolution_percentiles', 'time_to_first_response', 'time_in_status']:
+        bench.run(f'analytics_{name}', getattr(analytics, name))
+
+    # Penulisan (terakhir, karena mengubah dataset)
+    bench.run_each('create', lambda _: repo.create(_new_ticket(rnd, repo.allocate_ticket_id())), range(SAMPLE_SIZE))
+    bench.run_each('update_status', lambda ticket_id: repo.update(ticket_id, {
+        'status': rnd.choice(["In Progress", "Resolved"]),
+        'updated_at': datetime.now().strftime(TIMESTAMP_FORMAT)
+    }), ids)
+    bench.run_each('add_comment', lambda ticket_id: repo.add_comment(ticket_id, {
+        'author': "Benchmark", 'text': "komentar benchmark", 'timestamp': datetime.now().strftime(TIMESTAMP_FORMAT)
+    }, datetime.now().strftime(TIMESTAMP_FORMAT)), ids)
+    bench.run('analytics_refresh_after_writes', analytics.refresh, repeat=1)
+    storage.wait_for_compaction()
+
+
+def _release_app_resources():
+    """Menghentikan scheduler SLA dan menutup repository bersama dari run AppTest"""
+    from streamlit.testing.v1 import AppTest
+
+    # Cache resource hanya terbaca di dalam script Streamlit, jadi dilepas lewat AppTest juga
+    def release():
+        from resources import release_shared_resources
+        release_shared_resources()
+
+    AppTest.from_function(release, default_timeout=60).run()
+
+
+def run_apptest(bench):
+    """Waktu render setiap halaman lewat Streamlit AppTest (repository sudah berisi dataset)"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # Mulai dari resource baru untuk backend ini
+    st.cache_resource.clear()
+    try:
+        _run_apptest_views(bench, AppTest.from_file(APP_PATH, default_timeout=3600))
+    finally:
+        _release_app_resources()
+
+
+def _run_apptest_views(bench, app):
+    """Run pertama, rerun setiap halaman, dan pencarian kata kunci"""
+    start = time.perf_counter()
+    app.run()
+    bench.record('apptest_first_run', _stats([time.perf_counter() - start]))
+
+    def check(name):
+        if app.exception:
+            raise RuntimeError(f"{name}: {app.exception[0].message}")
+
+    check('apptest_first_run')
+    for view in VIEWS:
+        # Dua run pertama memindahkan halaman; yang diukur adalah rerun halaman tersebut
+        for _ in range(2):
+            app.sidebar.radio[0].set_value(view).run()
+        check(view)
+        bench.run(f"apptest_{view.lower().replace(' ', '_')}", app.run)
+        check(view)
+
+    # Cari Tiket mode kata kunci: isi query lalu klik Cari
+    app.sidebar.radio[0].set_value("Cari Tiket").run()
+    next(radio for radio in app.radio if radio.label == "Cari berdasarkan:").set_value("Kata Kunci").run()
+    next(text for text in app.text_input if text.label == "Masukkan Kata Kunci").input(KEYWORDS[0]).run()
+    bench.run(
+        'apptest_search_keyword',
+        lambda: next(button for button in app.button if "Cari" in button.label).click().run()
+    )
+    check('apptest_search_keyword')
+
+
+def run_backend(backend, count, seed, repeat, apptest=False, keep=False):
+    workdir = tempfile.mkdtemp(prefix=f"benchmark_{backend}_")
+    previous_dir = os.getcwd()
+    previous_backend = os.environ.get("TICKETS_BACKEND")
+    print(f"[{backend}] {count} tiket di {workdir}", flush=True)
+    bench = Benchmark(backend, repeat)
+    os.chdir(workdir)
+    os.environ["TICKETS_BACKEND"] = backend
+    try:
+        run_headless(bench, count, seed)
+        if apptest:
+            run_apptest(bench)
+    finally:
+        storage.wait_for_compaction()
+        os.chdir(previous_dir)
+        if previous_backend is None:
+            os.environ.pop("TICKETS_BACKEND", None)
+        else:
+            os.environ["TICKETS_BACKEND"] = previous_backend
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return bench
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(APP_PATH),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def check_ticket_counts(results, baseline=None):
+    """Pesan kesalahan jika jumlah tiket antar backend (dan terhadap baseline) tidak sama.
+
+    Import yang gagal sebagian membuat backend lebih "cepat" karena datanya
+    lebih sedikit; hasil seperti itu tidak boleh dibandingkan.
+    """
+    problems = []
+    expected = results['meta']['tickets']
+    for backend, count in results['meta']['ticket_counts'].items():
+        if count != expected:
+            problems.append(f"[{backend}] berisi {count} tiket, seharusnya {expected}")
+    previous = (baseline or {}).get('meta', {}).get('ticket_counts', {})
+    for backend, count in results['meta']['ticket_counts'].items():
+        if backend in previous and previous[backend] != count:
+            problems.append(f"[{backend}] berisi {count} tiket, baseline {previous[backend]}")
+    return problems
+
+
+def compare(results, baseline, factor=REGRESSION_FACTOR):
+    """Operasi yang median-nya lebih lambat dari baseline: list (backend, nama, baseline ms, sekarang ms)"""
+    regressions = []
+    for backend, operations in results['backends'].items():
+        previous = baseline.get('backends', {}).get(backend, {})
+        for name, stats in operations.items():
+            if name not in previous:
+                continue
+            before, after = previous[name]['median_ms'], stats['median_ms']
+            if after > before * factor and after - before > REGRESSION_MIN_MS:
+                regressions.append((backend, name, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur utama aplikasi tiket")
+    parser.add_argument("--tickets", type=int, default=10000, help="Jumlah tiket sintetis (default 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Pengulangan untuk operasi berat (default 5)")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="Default: semua backend")
+    parser.add_argument("--apptest", action="store_true", help="Ukur juga render halaman lewat Streamlit AppTest")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="File hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus folder data sementara")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'created_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+            'tickets': args.tickets,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'ticket_counts': {},
+        },
+        'backends': {},
+    }
+    for backend in args.backend or BACKENDS:
+        bench = run_backend(backend, args.tickets, args.seed, args.repeat, args.apptest, args.keep)
+        results['backends'][backend] = bench.results
+        results['meta']['ticket_counts'][backend] = bench.ticket_count
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    problems = check_ticket_counts(results, baseline)
+    for problem in problems:
+        print(f"DATA TIDAK SAMA {problem}")
+    if problems:
+        sys.exit(1)
+
+    if args.compare:
+        regressions = compare(results, baseline)
+        for backend, name, before, after in regressions:
+            print(f"REGRESI [{backend}] {name}: {before:.2f} ms -> {after:.2f} ms ({after / before:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("Tidak ada regresi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Generator dataset tiket sintetis untuk benchmark dan uji skala.
+
+Data dibuat deterministik dari `seed`, dengan distribusi yang menyerupai
+helpdesk sungguhan: kategori dan prioritas tidak merata, tiket lama sebagian
+besar sudah Resolved/Closed sedangkan tiket baru masih Open/In Progress,
+sebagian kecil pelanggan membuat banyak tiket, dan tiket yang sudah ditangani
+punya thread komentar. Riwayat status (events.py) dibuat sesuai alur
+tersebut sehingga analitik SLA punya data yang masuk akal.
+
+Tiket dihasilkan satu per satu (generator), jadi 1 juta tiket bisa ditulis
+tanpa memuat semuanya ke memori.
+
+Contoh (CLI):
+    python datagen.py tiket_100k.ndjson --tickets 100000 --seed 7
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+from events import EVENT_COMMENT, EVENT_CREATED, EVENT_STATUS, make_event
+from models import TIMESTAMP_FORMAT
+from ticket_index import format_ticket_id
+
+# Tanggal tiket terakhir; tetap (bukan hari ini) agar dataset dengan seed sama selalu identik
+DEFAULT_END = datetime(2024, 12, 31, 17, 0, 0)
+DEFAULT_DAYS = 365
+
+CATEGORY_WEIGHTS = {'Teknis': 35, 'Billing': 20, 'Akun': 20, 'Produk': 15, 'Lainnya': 10}
+PRIORITY_WEIGHTS = {'Low': 50, 'Medium': 35, 'High': 15}
+CATEGORY_DEPARTMENTS = {
+    'Teknis': ['IT Support', 'Technical'],
+    'Billing': ['Billing'],
+    'Akun': ['Customer Service', 'IT Support'],
+    'Produk': ['Sales', 'Customer Service'],
+    'Lainnya': ['Customer Service'],
+}
+# Peluang tiket dalam BACKLOG_DAYS terakhir belum ditangani sama sekali
+BACKLOG_DAYS = 30
+BACKLOG_RATE = 0.3
+
+# Rata-rata jam sampai tiket ditangani / diselesaikan, per prioritas
+RESPONSE_HOURS = {'High': 2, 'Medium': 8, 'Low': 24}
+RESOLUTION_HOURS = {'High': 12, 'Medium': 48, 'Low': 120}
+
+FIRST_NAMES = [
+    "Budi", "Siti", "Andi", "Dewi", "Rizky", "Putri", "Agus", "Rina", "Hendra", "Ayu",
+    "Fajar", "Indah", "Yoga", "Sari", "Dimas", "Lestari", "Bayu", "Wulan", "Eko", "Nina",
+]
+LAST_NAMES = [
+    "Santoso", "Wijaya", "Pratama", "Lestari", "Saputra", "Hidayat", "Kusuma", "Nugroho",
+    "Wibowo", "Setiawan", "Siregar", "Harahap", "Gunawan", "Permata", "Rahman",
+]
+# Domain besar muncul jauh lebih sering daripada domain perusahaan
+EMAIL_DOMAINS = {
+    'gmail.com': 40, 'yahoo.co.id': 15, 'outlook.com': 10, 'example.com': 5,
+    'tokomaju.co.id': 3, 'kantorku.id': 3, 'ptsejahtera.com': 2, 'kampus.ac.id': 2,
+}
+AGENTS = [
+    "Tech Support - Alice", "Tech Support - Bima", "Billing - Citra", "CS - Dodi", "CS - Eka", "Sales - Fani",
+]
+
+SUBJECTS = {
+    'Teknis': [
+        "Tidak bisa login ke {product}", "Error 500 saat membuka {product}", "{product} sangat lambat",
+        "Notifikasi {product} tidak muncul", "Sinkronisasi data {product} gagal",
+    ],
+    'Billing': [
+        "Tagihan {product} tidak sesuai", "Pembayaran {product} belum terverifikasi",
+        "Minta refund {product}", "Invoice {product} ganda",
+    ],
+    'Akun': [
+        "Reset password akun {product}", "Akun {product} terkunci", "Ganti email akun {product}",
+        "Verifikasi dua langkah {product} bermasalah",
+    ],
+    'Produk': [
+        "Pertanyaan fitur {product}", "Permintaan fitur baru di {product}", "Cara export laporan {product}",
+        "Perbandingan paket {product}",
+    ],
+    'Lainnya': ["Saran untuk layanan {product}", "Keluhan pelayanan {product}", "Pertanyaan umum {product}"],
+}
+PRODUCTS = ["aplikasi mobile", "dashboard admin", "portal pelanggan", "API", "modul kasir", "aplikasi desktop"]
+DESCRIPTION_PARTS = [
+    "Masalah ini terjadi sejak kemarin sore.",
+    "Sudah dicoba di browser lain tetapi hasilnya sama.",
+    "Mohon segera dibantu karena mengganggu operasional.",
+    "Screenshot error sudah saya siapkan jika diperlukan.",
+    "Beberapa rekan di kantor juga mengalami hal serupa.",
+    "Sebelumnya semua berjalan normal.",
+    "Saya menggunakan versi terbaru.",
+    "Terjadi setelah update terakhir.",
+]
+AGENT_REPLIES = [
+    "Terima kasih, laporan sudah kami terima dan sedang dicek.",
+    "Mohon coba hapus cache lalu login ulang.",
+    "Kami sudah menemukan penyebabnya, perbaikan sedang diproses.",
+    "Bisa dikirimkan screenshot error yang muncul?",
+    "Perbaikan sudah dirilis, silakan dicoba kembali.",
+]
+CUSTOMER_REPLIES = [
+    "Sudah saya coba tetapi masih error.",
+    "Terima kasih, sekarang sudah normal kembali.",
+    "Screenshot sudah saya lampirkan.",
+    "Kapan kira-kira bisa selesai?",
+]
+
+
+def _weighted(rnd, weights):
+    return rnd.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _timestamp(moment):
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
+def _hours(rnd, mean):
+    """Durasi acak (jam) berdistribusi eksponensial dengan rata-rata `mean`"""
+    return timedelta(hours=rnd.expovariate(1 / mean))
+
+
+class _Customers:
+    """Pelanggan dengan sebaran tidak merata: sebagian kecil membuat banyak tiket"""
+
+    def __init__(self, rnd, count):
+        self.rnd = rnd
+        self.count = max(1, count)
+
+    def pick(self):
+        # Nomor pelanggan kecil jauh lebih sering terpilih (pelanggan "langganan")
+        number = int(self.count * self.rnd.random() ** 3)
+        rnd = random.Random(number)
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        domain = _weighted(rnd, EMAIL_DOMAINS)
+        return {
+            'name': f"{first} {last}",
+            'email': f"{first.lower()}.{last.lower()}{number}@{domain}",
+            'phone': f"+62 8{rnd.randint(11, 99)}-{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+        }
+
+
+def _comments_and_events(rnd, ticket, created, agent, now):
+    """Alur penanganan tiket: komentar, event, status akhir, dan waktu aktivitas terakhir"""
+    ticket_id = ticket['id']
+    last = created
+    events = [make_event(ticket_id, ticket['created_at'], EVENT_CREATED, to_status='Open')]
+    comments = []
+    status = 'Open'
+    moment = created + _hours(rnd, RESPONSE_HOURS[ticket['priority']])
+
+    def add_status(new_status):
+        nonlocal status, last
+        last = moment
+        events.append(make_event(ticket_id, _timestamp(moment), EVENT_STATUS, from_status=status, to_status=new_status))
+        status = new_status
+
+    def add_comment(author, text):
+        nonlocal last
+        last = moment
+        comments.append({'author': author, 'text': text, 'timestamp': _timestamp(moment)})
+        events.append(make_event(ticket_id, _timestamp(moment), EVENT_COMMENT, author=author))
+
+    in_backlog = now - created < timedelta(days=BACKLOG_DAYS) and rnd.random() < BACKLOG_RATE
+    if moment < now and not in_backlog:
+        add_status('In Progress')
+        add_comment(agent, rnd.choice(AGENT_REPLIES))
+        for _ in range(rnd.choices([0, 1, 2, 3, 5], weights=[30, 30, 20, 12, 8])[0]):
+            moment += _hours(rnd, 6)
+            if moment >= now:
+                break
+            if rnd.random() < 0.5:
+                add_comment(ticket['name'], rnd.choice(CUSTOMER_REPLIES))
+            else:
+                add_comment(agent, rnd.choice(AGENT_REPLIES))
+        moment += _hours(rnd, RESOLUTION_HOURS[ticket['priority']])
+        if moment < now and rnd.random() < 0.9:
+            add_status('Resolved')
+            moment += _hours(rnd, 72)
+            if moment < now and rnd.random() < 0.8:
+                add_status('Closed')
+    return comments, events, status, _timestamp(last)
+
+
+def generate(count, seed=0, end=DEFAULT_END, days=DEFAULT_DAYS, first_number=1):
+    """Menghasilkan (tiket, events) sebanyak `count`, urut waktu pembuatan.
+
+    Tiket berisi field 'comments'; events adalah riwayat lengkapnya (lihat
+    events.py) untuk repo.import_tickets(tickets, events).
+    """
+    rnd = random.Random(seed)
+    customers = _Customers(rnd, count // 4)
+    start = end - timedelta(days=days)
+    step = (end - start) / max(1, count)
+    for position in range(count):
+        created = start + step * position + timedelta(seconds=rnd.uniform(0, step.total_seconds()))
+        category = _weighted(rnd, CATEGORY_WEIGHTS)
+        product = rnd.choice(PRODUCTS)
+        ticket = {
+            'id': format_ticket_id(first_number + position),
+            **customers.pick(),
+            'category': category,
+            'priority': _weighted(rnd, PRIORITY_WEIGHTS),
+            'department': rnd.choice(CATEGORY_DEPARTMENTS[category]),
+            'subject': rnd.choice(SUBJECTS[category]).format(product=product),
+            'description': " ".join(rnd.sample(DESCRIPTION_PARTS, rnd.randint(1, 3))),
+            'created_at': _timestamp(created),
+        }
+        agent = rnd.choice(AGENTS)
+        comments, events, status, updated_at = _comments_and_events(rnd, ticket, created, agent, end)
+        ticket['status'] = status
+        ticket['updated_at'] = updated_at
+        ticket['comments'] = comments
+        ticket['assigned_to'] = agent if status != 'Open' else None
+        yield ticket, events
+
+
+def write_dataset(path, count, seed=0, fmt=None, **options):
+    """Menulis dataset ke file JSON (array) atau NDJSON untuk import; mengembalikan jumlah tiket"""
+    fmt = fmt or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json')
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'json':
+            f.write("[\n")
+        for position, (ticket, _) in enumerate(generate(count, seed, **options)):
+            line = json.dumps(ticket, ensure_ascii=False)
+            if fmt == 'json':
+                f.write((",\n" if position else "") + line)
+            else:
+                f.write(line + "\n")
+        if fmt == 'json':
+            f.write("\n]\n")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Membuat dataset tiket sintetis")
+    parser.add_argument("path", help="File tujuan (.json atau .ndjson)")
+    parser.add_argument("--tickets", type=int, default=10000, help="Jumlah tiket (default 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Rentang tanggal pembuatan tiket")
+    parser.add_argument("--format", choices=["json", "ndjson"], help="Default: dari ekstensi file")
+    args = parser.parse_args()
+    write_dataset(args.path, args.tickets, args.seed, args.format, days=args.days)
+    print(f"{args.tickets} tiket ditulis ke {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Event riwayat tiket (event sourcing) untuk analitik waktu respons dan SLA.
+
+Setiap tiket mencatat event berurutan waktu:
+- created: tiket dibuat (to_status = status awal)
+- status:  status berubah dari from_status ke to_status
+- comment: komentar ditambahkan oleh `author`
+
+Event hanya ditambahkan (append-only) dan disimpan oleh repository
+(tabel ticket_events di SQLite, atau tickets_data.events untuk backend JSON).
+"""
+
+from datetime import datetime
+
+from models import TIMESTAMP_FORMAT
+
+EVENT_CREATED = 'created'
+EVENT_STATUS = 'status'
+EVENT_COMMENT = 'comment'
+
+EVENT_FIELDS = ['ticket_id', 'at', 'type', 'from_status', 'to_status', 'author']
+
+
+def now_timestamp():
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+def make_event(ticket_id, at, event_type, from_status=None, to_status=None, author=None):
+    return {
+        'ticket_id': ticket_id,
+        'at': at,
+        'type': event_type,
+        'from_status': from_status,
+        'to_status': to_status,
+        'author': author
+    }
+
+
+def created_event(ticket):
+    return make_event(ticket['id'], ticket['created_at'], EVENT_CREATED, to_status=ticket['status'])
+
+
+def status_event(ticket_id, at, from_status, to_status):
+    return make_event(ticket_id, at, EVENT_STATUS, from_status=from_status, to_status=to_status)
+
+
+def comment_event(ticket_id, comment):
+    return make_event(ticket_id, comment['timestamp'], EVENT_COMMENT, author=comment['author'])
+
+
+def backfill_events(ticket):
+    """Event perkiraan untuk tiket lama yang belum punya riwayat.
+
+    Tiket dianggap dibuat dengan status Open. Jika statusnya sekarang berbeda,
+    perpindahan status dicatat pada updated_at (satu-satunya waktu yang
+    tersedia), lalu komentar dicatat sesuai timestamp masing-masing.
+    """
+    events = [make_event(ticket['id'], ticket['created_at'], EVENT_CREATED, to_status='Open')]
+    if ticket['status'] != 'Open':
+        events.append(status_event(ticket['id'], ticket['updated_at'], 'Open', ticket['status']))
+    events.extend(comment_event(ticket['id'], c) for c in ticket.get('comments') or [])
+    return events
@@ -0,0 +1,154 @@
+"""Export tiket secara streaming ke CSV, JSON, NDJSON, atau Parquet.
+
+Tiket dibaca dari repository per potongan (repo.iter_tickets), komentarnya
+digabungkan per potongan (repo.with_comments), lalu setiap potongan langsung
+diubah menjadi bytes, sehingga memori puncak tidak bergantung pada jumlah
+tiket. Export hanya dijalankan saat diminta.
+
+Di CSV, kolom comments dan attachments berisi list dalam format JSON.
+Lampiran diexport sebagai referensi (sha256, name, size, type); file-nya
+tetap di folder attachments/.
+
+Contoh (CLI):
+    python repository.py export tickets.ndjson --format ndjson --status Open
+"""
+
+import csv
+import io
+import json
+from datetime import timedelta
+
+from repository import ITER_CHUNK_SIZE, TICKET_FIELDS
+
+EXPORT_COLUMNS = TICKET_FIELDS + ['comments', 'attachments']
+
+# format -> (label, ekstensi file, MIME type)
+EXPORT_FORMATS = {
+    'csv': ("CSV", "csv", "text/csv"),
+    'json': ("JSON", "json", "application/json"),
+    'ndjson': ("NDJSON", "ndjson", "application/x-ndjson"),
+    'parquet': ("Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def date_bounds(start_date=None, end_date=None):
+    """Tanggal (inklusif) -> batas created_at (start inklusif, end eksklusif)"""
+    start = start_date.strftime("%Y-%m-%d 00:00:00") if start_date else None
+    end = (end_date + timedelta(days=1)).strftime("%Y-%m-%d 00:00:00") if end_date else None
+    return start, end
+
+
+def _csv_chunks(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        writer.writerows(
+            [ticket.get(column) for column in TICKET_FIELDS]
+            + [json.dumps(ticket.get('comments') or [], ensure_ascii=False)]
+            + [json.dumps(ticket.get('attachments') or [], ensure_ascii=False)]
+            for ticket in chunk
+        )
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _json_chunks(chunks):
+    # Hasil sama dengan json.dumps(list_tiket, indent=2), tetapi per potongan
+    separator = "[\n  "
+    for chunk in chunks:
+        parts = []
+        for ticket in chunk:
+            parts.append(separator)
+            parts.append(json.dumps(ticket, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            separator = ",\n  "
+        yield "".join(parts).encode('utf-8')
+    yield b"[]" if separator == "[\n  " else b"\n]"
+
+
+def _ndjson_chunks(chunks):
+    for chunk in chunks:
+        yield "".join(json.dumps(ticket, ensure_ascii=False) + "\n" for ticket in chunk).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """File tujuan ParquetWriter yang menampung bytes sampai diambil oleh drain()"""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet_chunks(chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Export Parquet membutuhkan paket pyarrow")
+
+    comment_type = pa.struct([('author', pa.string()), ('text', pa.string()), ('timestamp', pa.string())])
+    attachment_type = pa.struct(
+        [('sha256', pa.string()), ('name', pa.string()), ('size', pa.int64()), ('type', pa.string())]
+    )
+    schema = pa.schema(
+        [(field, pa.string()) for field in TICKET_FIELDS]
+        + [('comments', pa.list_(comment_type)), ('attachments', pa.list_(attachment_type))]
+    )
+    sink = _ChunkSink()
+    # Satu row group per potongan tiket
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_WRITERS = {
+    'csv': _csv_chunks,
+    'json': _json_chunks,
+    'ndjson': _ndjson_chunks,
+    'parquet': _parquet_chunks,
+}
+
+
+def iter_export(repo, fmt, statuses=None, start_date=None, end_date=None, chunk_size=ITER_CHUNK_SIZE):
+    """Generator bytes hasil export dalam format `fmt` (lihat EXPORT_FORMATS)"""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Format export tidak didukung: {fmt}")
+    start, end = date_bounds(start_date, end_date)
+    chunks = repo.iter_tickets(statuses, start, end, chunk_size)
+    return _WRITERS[fmt](repo.with_comments(chunk) for chunk in chunks)
+
+
+def write_export(repo, fileobj, fmt, **filters):
+    """Menulis export ke file biner `fileobj` per potongan; mengembalikan jumlah bytes"""
+    size = 0
+    for data in iter_export(repo, fmt, **filters):
+        fileobj.write(data)
+        size += len(data)
+    return size
@@ -0,0 +1,340 @@
+"""Import tiket massal dari file JSON, NDJSON, atau CSV.
+
+File dibaca secara streaming (tidak dimuat utuh ke memori), record divalidasi
+dan dinormalisasi per batch, ID baru dialokasikan sekaligus untuk satu batch,
+dan setiap batch disimpan dengan satu kali penulisan (repo.import_tickets).
+Record yang tidak valid tidak menghentikan import; nomor baris dan alasannya
+dicatat di laporan.
+
+Contoh (CLI):
+    python repository.py import tiket_lama.ndjson --rejects ditolak.ndjson
+"""
+
+import ast
+import csv
+import io
+import json
+import re
+import time
+from datetime import datetime
+
+from attachments import blob_path
+from models import CATEGORIES, DEPARTMENTS, PRIORITIES, STATUSES, TIMESTAMP_FORMAT
+from repository import TICKET_FIELDS
+from ticket_index import format_ticket_id, normalize_ticket_id, ticket_number
+
+IMPORT_FORMATS = ['json', 'ndjson', 'csv']
+IMPORT_BATCH_SIZE = 5000
+
+# Contoh record ditolak yang disimpan di laporan (jumlahnya tetap dihitung semua)
+MAX_REPORTED_REJECTS = 1000
+
+REQUIRED_FIELDS = ['name', 'email', 'subject', 'description']
+FIELD_CHOICES = {
+    'category': CATEGORIES,
+    'priority': PRIORITIES,
+    'department': DEPARTMENTS,
+    'status': STATUSES,
+}
+FIELD_DEFAULTS = {
+    'category': 'Lainnya',
+    'priority': 'Medium',
+    'department': 'Customer Service',
+    'status': 'Open',
+}
+# Nilai pilihan dicocokkan tanpa membedakan huruf besar/kecil
+_CHOICE_LOOKUP = {
+    field: {choice.lower(): choice for choice in choices}
+    for field, choices in FIELD_CHOICES.items()
+}
+
+_EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_TICKET_ID_PATTERN = re.compile(r"^TKT-\d+$")
+_WHITESPACE = re.compile(r"\s*")
+
+
+class ImportFormatError(ValueError):
+    """File import rusak sehingga pembacaan tidak bisa dilanjutkan"""
+
+
+def detect_format(filename):
+    """Format import dari ekstensi file (default: json)"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    if extension == 'csv':
+        return 'csv'
+    return 'json'
+
+
+def _iter_json_array(f, read_size=1 << 16):
+    """Objek di dalam array JSON tingkat atas, dibaca per blok `read_size`"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(read_size)
+    position = _WHITESPACE.match(buffer).end()
+    if buffer[position:position + 1] != '[':
+        raise ImportFormatError("File JSON harus berisi array tiket")
+    position += 1
+    expect_comma = False
+    eof = False
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer):
+            char = buffer[position]
+            if char == ']':
+                return
+            if expect_comma:
+                if char != ',':
+                    raise ImportFormatError(f"Karakter tidak terduga di JSON: {char!r}")
+                position += 1
+                expect_comma = False
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ImportFormatError(f"JSON tidak valid: {exc}")
+            else:
+                # Angka di ujung buffer bisa saja belum lengkap; objek/string selalu lengkap
+                if end < len(buffer) or eof or char in '{["':
+                    yield value
+                    position = end
+                    expect_comma = True
+                    continue
+        elif eof:
+            raise ImportFormatError("File JSON berakhir sebelum array ditutup")
+        chunk = f.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_records(f, fmt):
+    """(nomor record, record atau pesan error) dari file teks `f`"""
+    if fmt == 'json':
+        for number, record in enumerate(_iter_json_array(f), start=1):
+            yield number, record
+    elif fmt == 'ndjson':
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, f"JSON tidak valid: {exc.msg}"
+    elif fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(f), start=1):
+            yield number, row
+    else:
+        raise ValueError(f"Format import tidak didukung: {fmt}")
+
+
+def _text(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _timestamp(value):
+    """Berbagai format waktu (ISO, tanggal saja) -> format timestamp tiket"""
+    text = _text(value)
+    if not text:
+        return None
+    if text.endswith('Z'):
+        text = text[:-1]
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime(TIMESTAMP_FORMAT)
+
+
+def _comments(value, created_at):
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        # CSV: komentar berupa JSON, atau repr list Python dari export lama
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            value = ast.literal_eval(value)
+    if not isinstance(value, list):
+        raise ValueError("comments harus berupa list")
+    comments = []
+    for comment in value:
+        if not isinstance(comment, dict) or not _text(comment.get('text')):
+            raise ValueError("komentar harus memiliki text")
+        comments.append({
+            'author': _text(comment.get('author')) or 'Unknown',
+            'text': _text(comment.get('text')),
+            'timestamp': _timestamp(comment.get('timestamp')) or created_at
+        })
+    return comments
+
+
+def _attachments(value):
+    """Referensi lampiran dari export (list, atau JSON di CSV); file-nya tidak ikut diimport"""
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, list):
+        raise ValueError("attachments harus berupa list")
+    attachments = []
+    for item in value:
+        if not isinstance(item, dict) or not _text(item.get('name')):
+            raise ValueError("lampiran harus memiliki name")
+        # blob_path melempar ValueError untuk hash yang tidak valid
+        blob_path(_text(item.get('sha256')))
+        attachments.append({
+            'sha256': _text(item.get('sha256')),
+            'name': _text(item.get('name')),
+            'size': int(item.get('size') or 0),
+            'type': _text(item.get('type')) or 'application/octet-stream',
+        })
+    return attachments
+
+
+def normalize_record(record, now):
+    """Record mentah -> tiket ter-normalisasi. Melempar ValueError jika tidak valid.
+
+    ID berformat TKT-<angka> dipertahankan dalam bentuk baku (TKT-7 ->
+    TKT-007); jika tidak, 'id' dikosongkan dan dialokasikan saat batch
+    disimpan.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record harus berupa objek")
+    ticket = {field: _text(record.get(field)) for field in TICKET_FIELDS}
+    missing = [field for field in REQUIRED_FIELDS if not ticket[field]]
+    if missing:
+        raise ValueError(f"field wajib kosong: {', '.join(missing)}")
+    if not _EMAIL_PATTERN.match(ticket['email']):
+        raise ValueError(f"email tidak valid: {ticket['email']}")
+    for field, lookup in _CHOICE_LOOKUP.items():
+        if not ticket[field]:
+            ticket[field] = FIELD_DEFAULTS[field]
+        elif ticket[field].lower() in lookup:
+            ticket[field] = lookup[ticket[field].lower()]
+        else:
+            raise ValueError(f"{field} tidak dikenal: {ticket[field]}")
+    ticket_id = normalize_ticket_id(ticket['id'])
+    ticket['id'] = format_ticket_id(ticket_number(ticket_id)) if _TICKET_ID_PATTERN.match(ticket_id) else None
+    try:
+        ticket['created_at'] = _timestamp(ticket['created_at']) or now
+        ticket['updated_at'] = _timestamp(ticket['updated_at']) or ticket['created_at']
+        ticket['comments'] = _comments(record.get('comments'), ticket['created_at'])
+        ticket['attachments'] = _attachments(record.get('attachments'))
+    except (ValueError, SyntaxError, TypeError) as exc:
+        raise ValueError(str(exc) or "format tidak valid")
+    ticket['assigned_to'] = ticket['assigned_to'] or None
+    return ticket
+
+
+class ImportReport:
+    """Ringkasan import: jumlah dibaca/diimport/ditolak, durasi, dan throughput"""
+
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.rejects = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def reject(self, number, error):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REPORTED_REJECTS:
+            self.rejects.append({'record': number, 'error': error})
+
+    @property
+    def throughput(self):
+        """Record per detik"""
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (
+            f"{self.imported} tiket diimport, {self.duplicates} duplikat dilewati, "
+            f"{self.rejected} ditolak dari {self.read} record "
+            f"dalam {self.seconds:.1f} detik ({self.throughput:,.0f} record/detik)"
+        )
+
+
+def _flush(repo, batch, report):
+    """Menyimpan satu batch; mengembalikan ID yang dialokasikan untuk record tanpa ID"""
+    without_id = [ticket for ticket in batch if ticket['id'] is None]
+    allocated = []
+    if without_id:
+        # ID baru harus melewati ID eksplisit di batch ini agar tidak bentrok
+        highest = max((ticket_number(t['id']) for t in batch if t['id'] is not None), default=0)
+        if highest:
+            repo.reserve_ticket_number(highest)
+        allocated = repo.allocate_ticket_ids(len(without_id))
+        for ticket, ticket_id in zip(without_id, allocated):
+            ticket['id'] = ticket_id
+    imported = len(repo.import_tickets(batch))
+    report.imported += imported
+    report.duplicates += len(batch) - imported
+    return allocated
+
+
+def import_stream(repo, f, fmt, batch_size=IMPORT_BATCH_SIZE, on_reject=None, on_batch=None):
+    """Mengimport semua record dari file teks `f`; mengembalikan ImportReport.
+
+    `on_reject(number, record, error)` dipanggil untuk setiap record yang
+    ditolak, `on_batch(report)` setelah setiap batch tersimpan.
+    """
+    report = ImportReport()
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    batch = []
+    batch_ids = set()
+    # ID yang sudah dialokasikan untuk record tanpa ID di batch sebelumnya
+    allocated_ids = set()
+    for number, record in iter_records(f, fmt):
+        report.read += 1
+        try:
+            if isinstance(record, str):
+                raise ValueError(record)
+            ticket = normalize_record(record, now)
+            if ticket['id'] is not None and ticket['id'] in batch_ids:
+                raise ValueError(f"ID ganda di file: {ticket['id']}")
+            if ticket['id'] in allocated_ids:
+                raise ValueError(f"ID {ticket['id']} sudah dipakai record tanpa ID sebelumnya di file ini")
+        except ValueError as exc:
+            report.reject(number, str(exc))
+            if on_reject is not None:
+                on_reject(number, record, str(exc))
+            continue
+        batch.append(ticket)
+        if ticket['id'] is not None:
+            batch_ids.add(ticket['id'])
+        if len(batch) >= batch_size:
+            allocated_ids.update(_flush(repo, batch, report))
+            batch, batch_ids = [], set()
+            report.seconds = time.perf_counter() - report.started
+            if on_batch is not None:
+                on_batch(report)
+    if batch:
+        _flush(repo, batch, report)
+    report.seconds = time.perf_counter() - report.started
+    if on_batch is not None:
+        on_batch(report)
+    return report
+
+
+def import_file(repo, path, fmt=None, **options):
+    """Import dari path file; format dideteksi dari ekstensi jika tidak diberikan"""
+    fmt = fmt or detect_format(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return import_stream(repo, f, fmt, **options)
+
+
+def import_upload(repo, uploaded_file, **options):
+    """Import dari file upload Streamlit (file biner)"""
+    text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+    try:
+        return import_stream(repo, text, detect_format(uploaded_file.name), **options)
+    finally:
+        # Jangan menutup buffer milik Streamlit bersama wrapper
+        text.detach()
@@ -0,0 +1,46 @@
+"""Penghitung statistik tiket yang diperbarui secara inkremental.
+
+Jumlah tiket per status, prioritas, kategori, dan departemen disimpan di
+Counter dan diperbarui O(1) setiap kali tiket dibuat atau diubah, sehingga
+sidebar, dashboard, dan grafik tidak perlu menelusuri seluruh tiket atau
+membangun DataFrame di setiap rerun.
+"""
+
+import threading
+from collections import Counter
+
+METRIC_FIELDS = ['status', 'priority', 'category', 'department']
+
+
+class TicketMetrics:
+    """Agregat jumlah tiket per nilai field kategorikal"""
+
+    def __init__(self, tickets=()):
+        self.total = 0
+        self._counts = {field: Counter() for field in METRIC_FIELDS}
+        self._lock = threading.Lock()
+        for ticket in tickets:
+            self.on_create(ticket)
+
+    def on_create(self, ticket):
+        with self._lock:
+            self.total += 1
+            for field in METRIC_FIELDS:
+                self._counts[field][ticket.get(field)] += 1
+
+    def on_update(self, old_values, new_values):
+        """Memindahkan hitungan dari nilai lama ke nilai baru untuk field yang berubah"""
+        with self._lock:
+            for field in METRIC_FIELDS:
+                if field not in new_values or old_values.get(field) == new_values[field]:
+                    continue
+                counts = self._counts[field]
+                counts[old_values.get(field)] -= 1
+                if counts[old_values.get(field)] <= 0:
+                    del counts[old_values.get(field)]
+                counts[new_values[field]] += 1
+
+    def count_by(self, field):
+        """Salinan dict nilai -> jumlah untuk satu field"""
+        with self._lock:
+            return dict(self._counts[field])
@@ -0,0 +1,217 @@
+"""Model tiket ringkas untuk data di memori.
+
+Di JSON, tiket adalah dict berisi belasan string. Untuk jutaan tiket di
+memori (JsonTicketRepository), Ticket menyimpan field yang sama di __slots__:
+
+- status, priority, category, department sebagai kode integer kecil dari
+  Vocabulary (nilai string-nya hanya disimpan sekali),
+- created_at dan updated_at sebagai detik epoch (int), sehingga filter dan
+  pengurutan membandingkan integer, bukan string.
+
+Ticket tetap bisa dibaca seperti dict (ticket['status'], ticket.get(...),
+{**ticket}) dan nilainya dikembalikan dalam format JSON semula, jadi kode
+tampilan, export, dan index tidak perlu tahu representasinya. Konversi dari
+dan ke JSON lewat Ticket.from_dict() dan Ticket.to_dict().
+"""
+
+import sys
+import threading
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+
+from ticket_index import ticket_number
+
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+PRIORITIES = ["Low", "Medium", "High"]
+CATEGORIES = ["Teknis", "Billing", "Produk", "Akun", "Lainnya"]
+DEPARTMENTS = ["IT Support", "Customer Service", "Billing", "Technical", "Sales"]
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+class Vocabulary:
+    """Kode integer untuk nilai dari daftar tetap.
+
+    Nilai di luar daftar (misal dari data lama) mendapat kode baru di
+    belakang, sehingga tidak ada nilai yang hilang.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+        self._lock = threading.Lock()
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+    def codes(self, values):
+        """Himpunan kode untuk `values` (nilai yang belum pernah muncul diabaikan)"""
+        return {self._codes[value] for value in values if value in self._codes}
+
+
+STATUS_CODES = Vocabulary(STATUSES)
+PRIORITY_CODES = Vocabulary(PRIORITIES)
+CATEGORY_CODES = Vocabulary(CATEGORIES)
+DEPARTMENT_CODES = Vocabulary(DEPARTMENTS)
+
+VOCABULARIES = {
+    'status': STATUS_CODES,
+    'priority': PRIORITY_CODES,
+    'category': CATEGORY_CODES,
+    'department': DEPARTMENT_CODES,
+}
+
+
+def to_epoch(timestamp):
+    """"YYYY-MM-DD HH:MM:SS" -> detik epoch (int), atau None jika formatnya lain.
+
+    Waktu disimpan apa adanya (tanpa konversi zona waktu), jadi
+    from_epoch(to_epoch(t)) == t.
+    """
+    if timestamp.__class__ is not str or len(timestamp) != 19 or timestamp[10] != ' ':
+        return None
+    try:
+        return (datetime.fromisoformat(timestamp) - _EPOCH) // _SECOND
+    except (ValueError, TypeError):
+        return None
+
+
+def from_epoch(seconds):
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT)
+
+
+def _encode_time(value):
+    # Timestamp dengan format lain (atau None) disimpan apa adanya
+    epoch = to_epoch(value)
+    return value if epoch is None else epoch
+
+
+def _decode_time(value):
+    return from_epoch(value) if value.__class__ is int else value
+
+
+def _encode_assignee(value):
+    # Nama agen berulang di banyak tiket: cukup satu objek string
+    return sys.intern(value) if value.__class__ is str else value
+
+
+def _encode_attachments(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _decode_attachments(value):
+    return list(value) if isinstance(value, tuple) else value
+
+
+FIELDS = [
+    'id', 'name', 'email', 'phone', 'category', 'priority', 'department',
+    'subject', 'description', 'status', 'created_at', 'updated_at', 'assigned_to',
+    'version', 'attachments'
+]
+_FIELD_SET = frozenset(FIELDS)
+
+_ENCODERS = {
+    **{field: vocabulary.encode for field, vocabulary in VOCABULARIES.items()},
+    'created_at': _encode_time,
+    'updated_at': _encode_time,
+    'assigned_to': _encode_assignee,
+    'attachments': _encode_attachments,
+}
+_DECODERS = {
+    **{field: vocabulary.decode for field, vocabulary in VOCABULARIES.items()},
+    'created_at': _decode_time,
+    'updated_at': _decode_time,
+    'attachments': _decode_attachments,
+}
+
+
+class Ticket(Mapping):
+    """Tiket dalam bentuk ringkas, dibaca seperti dict.
+
+    Atribut slot menyimpan nilai mentah (kode Vocabulary, detik epoch);
+    akses lewat ticket[field] mengembalikan nilai JSON-nya. Field yang tidak
+    ada di data asal juga tidak ada di sini (KeyError), sama seperti dict.
+    Field di luar FIELDS disimpan di `_extra`.
+    """
+
+    __slots__ = FIELDS + ['_number', '_extra']
+
+    @classmethod
+    def from_dict(cls, data):
+        ticket = cls()
+        extra = None
+        for key, value in data.items():
+            encode = _ENCODERS.get(key)
+            if encode is not None:
+                value = encode(value)
+            if key in _FIELD_SET:
+                setattr(ticket, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        ticket._extra = extra
+        ticket._number = ticket_number(data.get('id'))
+        return ticket
+
+    def to_dict(self):
+        return {key: self[key] for key in self}
+
+    def update(self, fields):
+        """Mengubah field (nilai format JSON), seperti dict.update"""
+        for key, value in fields.items():
+            encode = _ENCODERS.get(key)
+            if encode is not None:
+                value = encode(value)
+            if key in _FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+            if key == 'id':
+                self._number = ticket_number(value)
+
+    def creation_key(self):
+        """Kunci urutan pembuatan (epoch created_at, nomor ID); lihat repository.creation_order_key"""
+        created = getattr(self, 'created_at', None)
+        return (created if created.__class__ is int else 0, self._number)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            decode = _DECODERS.get(key)
+            return value if decode is None else decode(value)
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __iter__(self):
+        for field in FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for field in FIELDS if hasattr(self, field)) + len(self._extra or ())
+
+    def __repr__(self):
+        return f"Ticket({self.to_dict()!r})"
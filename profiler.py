@@ -0,0 +1,309 @@
+"""Profiling per rerun Streamlit (opsional) untuk mencari bagian yang lambat.
+
+Setiap rerun app.py dibungkus start_rerun()/finish_rerun(). Di antaranya,
+bagian yang diukur ditandai dengan span():
+
+    with span("filter"):
+        page = repo.filter_page(...)
+
+span() dapat dipanggil dari modul mana pun (storage, analytics) karena
+profil aktif disimpan per thread (satu thread per sesi Streamlit). Jika
+profiling tidak aktif, span() tidak mengukur apa pun sehingga biayanya
+hampir nol.
+
+Profiling aktif untuk semua sesi jika environment TICKETS_PROFILE=1, atau
+per sesi lewat panel admin tersembunyi di sidebar (buka app dengan
+?admin=1). Hasilnya juga bisa ditulis sebagai log NDJSON
+(TICKETS_PROFILE_LOG, "-" untuk stderr) dan file teks format Prometheus
+(TICKETS_PROFILE_PROM, misal untuk textfile collector node_exporter).
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from models import TIMESTAMP_FORMAT
+
+PROFILE_ENV = "TICKETS_PROFILE"
+PROFILE_LOG_ENV = "TICKETS_PROFILE_LOG"
+PROFILE_PROM_ENV = "TICKETS_PROFILE_PROM"
+
+# Jumlah rerun terakhir yang disimpan untuk panel admin
+HISTORY_SIZE = 50
+
+# Umur maksimum pengukuran memori sebelum diukur ulang untuk file Prometheus (detik)
+MEMORY_REFRESH_SECONDS = 60
+
+# Container yang lebih besar dari ini diukur dari sampel isinya lalu diekstrapolasi
+MEMORY_SAMPLE_SIZE = 500
+
+logger = logging.getLogger("tickets.profile")
+
+_current = threading.local()
+
+
+def env_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+class RerunProfile:
+    """Span yang tercatat selama satu rerun"""
+
+    def __init__(self, view):
+        self.view = view
+        self.spans = []
+        self.started_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+        self._start = time.perf_counter()
+        self._depth = 0
+        self.total = None
+
+    @contextmanager
+    def span(self, name):
+        entry = {'name': name, 'depth': self._depth, 'seconds': 0.0}
+        self.spans.append(entry)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            self._depth -= 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self._start
+        return self.total
+
+    def untracked_seconds(self):
+        """Waktu rerun di luar span teratas (terutama render widget)"""
+        total = self.total if self.total is not None else time.perf_counter() - self._start
+        return max(0.0, total - sum(entry['seconds'] for entry in self.spans if entry['depth'] == 0))
+
+    def to_record(self):
+        return {
+            'timestamp': self.started_at,
+            'view': self.view,
+            'total_ms': round((self.total or 0.0) * 1000, 3),
+            'spans': [
+                {'name': entry['name'], 'depth': entry['depth'], 'ms': round(entry['seconds'] * 1000, 3)}
+                for entry in self.spans
+            ],
+        }
+
+
+def start_rerun(view, enabled):
+    """Memulai profil rerun untuk thread ini; None jika profiling tidak aktif"""
+    _current.profile = RerunProfile(view) if enabled else None
+    return _current.profile
+
+
+def current_profile():
+    return getattr(_current, 'profile', None)
+
+
+@contextmanager
+def span(name):
+    """Mengukur blok kode sebagai bagian dari profil rerun yang aktif (jika ada)"""
+    profile = getattr(_current, 'profile', None)
+    if profile is None:
+        yield
+        return
+    with profile.span(name):
+        yield
+
+
+class ProfileHistory:
+    """Rerun terakhir dan total kumulatif per span, dipakai bersama dalam satu proses"""
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.records = deque(maxlen=size)
+        # (metrik, label) -> [jumlah, total detik, maksimum detik]
+        self.totals = {}
+        self.memory = None
+        self._memory_measured_at = None
+        self._lock = threading.Lock()
+
+    def _add_total(self, key, seconds):
+        total = self.totals.setdefault(key, [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += seconds
+        total[2] = max(total[2], seconds)
+
+    def add(self, profile):
+        with self._lock:
+            self.records.append(profile.to_record())
+            self._add_total(('rerun', profile.view), profile.total)
+            for entry in profile.spans:
+                self._add_total(('span', entry['name']), entry['seconds'])
+
+    def set_memory(self, memory):
+        with self._lock:
+            self.memory = memory
+            self._memory_measured_at = time.monotonic()
+
+    def memory_due(self, max_age=MEMORY_REFRESH_SECONDS):
+        """True jika memori belum pernah diukur atau pengukurannya sudah lebih lama dari `max_age`"""
+        with self._lock:
+            return self._memory_measured_at is None or time.monotonic() - self._memory_measured_at > max_age
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records), {key: list(value) for key, value in self.totals.items()}, self.memory
+
+
+def finish_rerun(history, view=None):
+    """Menutup profil rerun thread ini, menyimpannya ke `history`, dan menulis output yang diminta.
+
+    `view` menggantikan nama halaman dari start_rerun() (halaman bisa berganti
+    di tengah rerun lewat menu navigasi).
+    """
+    profile = current_profile()
+    _current.profile = None
+    if profile is None:
+        return None
+    if view is not None:
+        profile.view = view
+    profile.finish()
+    history.add(profile)
+    log_path = os.environ.get(PROFILE_LOG_ENV)
+    if log_path:
+        write_log(log_path, profile.to_record())
+    prom_path = os.environ.get(PROFILE_PROM_ENV)
+    if prom_path:
+        write_prometheus(prom_path, history)
+    return profile
+
+
+def write_log(path, record):
+    """Satu baris JSON per rerun; path "-" menulis lewat logger ke stderr"""
+    line = json.dumps(record, ensure_ascii=False)
+    if path == "-":
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler(sys.stderr))
+            logger.setLevel(logging.INFO)
+        logger.info(line)
+        return
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line + "\n")
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(history):
+    """Total kumulatif dan memori terakhir dalam format teks Prometheus"""
+    _, totals, memory = history.snapshot()
+    lines = []
+    for metric, label, help_text in [
+        ('rerun', 'view', "Durasi rerun Streamlit per halaman"),
+        ('span', 'span', "Durasi bagian yang diukur di dalam rerun"),
+    ]:
+        name = f"tickets_{metric}_seconds"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+        for (kind, value), (count, seconds, _) in sorted(totals.items()):
+            if kind == metric:
+                lines.append(f'{name}_sum{{{label}="{_label(value)}"}} {seconds:.6f}')
+                lines.append(f'{name}_count{{{label}="{_label(value)}"}} {count}')
+        lines += [f"# HELP {name}_max Durasi terlama sejak proses dimulai", f"# TYPE {name}_max gauge"]
+        for (kind, value), (_, _, longest) in sorted(totals.items()):
+            if kind == metric:
+                lines.append(f'{name}_max{{{label}="{_label(value)}"}} {longest:.6f}')
+    if memory:
+        lines += ["# HELP tickets_store_memory_bytes Perkiraan memori struktur data tiket",
+                  "# TYPE tickets_store_memory_bytes gauge"]
+        for component, size in sorted(memory['components'].items()):
+            lines.append(f'tickets_store_memory_bytes{{component="{_label(component)}"}} {size}')
+        if memory.get('rss') is not None:
+            lines += ["# HELP tickets_process_resident_memory_bytes Memori resident proses",
+                      "# TYPE tickets_process_resident_memory_bytes gauge",
+                      f"tickets_process_resident_memory_bytes {memory['rss']}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, history):
+    """Menulis prometheus_text() secara atomik (file sementara lalu rename)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(prometheus_text(history))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _is_pandas(obj):
+    return type(obj).__module__.split('.')[0] == 'pandas'
+
+
+def deep_size(obj, seen=None):
+    """Perkiraan memori `obj` beserta isinya (bytes).
+
+    Container besar diukur dari sampel MEMORY_SAMPLE_SIZE item lalu
+    diekstrapolasi. Objek yang sudah terhitung (`seen`) tidak dihitung lagi,
+    sehingga tiket yang dirujuk beberapa struktur hanya dihitung sekali.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen or callable(obj):
+        return 0
+    seen.add(id(obj))
+    if _is_pandas(obj) and hasattr(obj, 'memory_usage'):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        items = [item for pair in obj.items() for item in pair]
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        items = list(obj)
+    elif hasattr(obj, '__dict__'):
+        items = list(vars(obj).values())
+    elif hasattr(type(obj), '__slots__'):
+        # Objek ber-__slots__ (misal models.Ticket): nilai slot yang terisi
+        items = [getattr(obj, name) for name in type(obj).__slots__ if hasattr(obj, name)]
+    else:
+        return size
+    if len(items) > MEMORY_SAMPLE_SIZE:
+        step = len(items) / MEMORY_SAMPLE_SIZE
+        sample = [items[int(position * step)] for position in range(MEMORY_SAMPLE_SIZE)]
+        return size + int(sum(deep_size(item, seen) for item in sample) * step)
+    return size + sum(deep_size(item, seen) for item in items)
+
+
+def process_rss():
+    """Memori resident proses (bytes), atau None jika tidak tersedia"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Puncak (bukan saat ini); satuan KB di Linux, bytes di macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_memory(structures):
+    """Perkiraan memori per komponen (dict nama -> objek) dan RSS proses"""
+    start = time.perf_counter()
+    seen = set()
+    components = {name: deep_size(obj, seen) for name, obj in structures.items() if obj is not None}
+    return {
+        'components': components,
+        'total': sum(components.values()),
+        'rss': process_rss(),
+        'measured_in_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
@@ -0,0 +1,88 @@
+"""Daftar tiket terbaru berukuran tetap untuk panel "Tiket Terbaru".
+
+Untuk semua tiket dan untuk setiap nilai status/prioritas disimpan paling
+banyak `capacity` tiket terbaru, terurut berdasarkan waktu pembuatan.
+Penambahan dan perubahan status hanya menyentuh bucket berukuran tetap,
+sehingga biaya query tidak bergantung pada jumlah riwayat tiket.
+"""
+
+import bisect
+import threading
+
+RECENT_FIELDS = ['status', 'priority']
+DEFAULT_CAPACITY = 50
+
+
+class RecentTickets:
+    """Top-K tiket terbaru, keseluruhan maupun per status/prioritas.
+
+    `refill(field, value, limit)` dipanggil jika bucket yang pernah terpotong
+    kekurangan isi (misal tiket pindah status); fungsi ini harus mengembalikan
+    tiket terbaru dengan nilai tersebut, terbaru lebih dulu.
+    """
+
+    def __init__(self, key, capacity=DEFAULT_CAPACITY, refill=None):
+        self._key = key
+        self.capacity = capacity
+        self._refill = refill
+        # (field, value) -> list terurut naik berisi (creation_key, ticket_id)
+        self._buckets = {}
+        # Bucket yang pernah membuang entri karena penuh (isinya tidak lengkap)
+        self._truncated = set()
+        self._lock = threading.Lock()
+
+    def _insert(self, bucket_key, entry):
+        bucket = self._buckets.setdefault(bucket_key, [])
+        if len(bucket) >= self.capacity and entry <= bucket[0]:
+            self._truncated.add(bucket_key)
+            return
+        bisect.insort(bucket, entry)
+        if len(bucket) > self.capacity:
+            del bucket[0]
+            self._truncated.add(bucket_key)
+
+    def _remove(self, bucket_key, entry):
+        bucket = self._buckets.get(bucket_key)
+        if not bucket:
+            return
+        position = bisect.bisect_left(bucket, entry)
+        if position < len(bucket) and bucket[position] == entry:
+            del bucket[position]
+
+    def add(self, ticket):
+        entry = (self._key(ticket), ticket['id'])
+        with self._lock:
+            self._insert((None, None), entry)
+            for field in RECENT_FIELDS:
+                self._insert((field, ticket.get(field)), entry)
+
+    def on_update(self, ticket, old_values):
+        """Memindahkan tiket ke bucket baru jika status/prioritasnya berubah"""
+        entry = (self._key(ticket), ticket['id'])
+        with self._lock:
+            for field in RECENT_FIELDS:
+                if field not in old_values or old_values[field] == ticket.get(field):
+                    continue
+                self._remove((field, old_values[field]), entry)
+                self._insert((field, ticket.get(field)), entry)
+
+    def latest(self, limit, field=None, value=None):
+        """ID `limit` tiket terbaru, opsional hanya untuk status/prioritas tertentu"""
+        bucket_key = (field, value) if field is not None else (None, None)
+        with self._lock:
+            bucket = self._buckets.get(bucket_key, [])
+            needs_refill = (
+                len(bucket) < limit
+                and bucket_key in self._truncated
+                and self._refill is not None
+            )
+            if not needs_refill:
+                return [ticket_id for _, ticket_id in reversed(bucket[-limit:])]
+        # Jarang terjadi: isi ulang bucket dari penyimpanan utama
+        tickets = self._refill(field, value, self.capacity)
+        with self._lock:
+            self._buckets[bucket_key] = sorted((self._key(t), t['id']) for t in tickets)
+            if len(tickets) < self.capacity:
+                self._truncated.discard(bucket_key)
+            bucket = self._buckets[bucket_key]
+            return [ticket_id for _, ticket_id in reversed(bucket[-limit:])]
@@ -0,0 +1,1280 @@
+"""Lapisan repository tiket yang dapat diganti (pluggable).
+
+Ada dua implementasi:
+- JsonTicketRepository: data di memori + journal JSON (lihat storage.py)
+- SqliteTicketRepository: database SQLite mode WAL dengan index untuk
+  filter, pencarian, dan hitungan dashboard
+
+Backend dipilih lewat environment variable TICKETS_BACKEND ("sqlite" atau
+"json"). File JSON tetap dipakai sebagai format import/export.
+
+Migrasi satu kali dari tickets_data.json:
+    python repository.py migrate
+"""
+
+import argparse
+import functools
+from contextlib import contextmanager
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import storage
+from events import (
+    EVENT_CREATED, EVENT_FIELDS, EVENT_STATUS, backfill_events, comment_event, created_event,
+    now_timestamp, status_event
+)
+from metrics import TicketMetrics
+from models import VOCABULARIES, Ticket, to_epoch
+from recent import RECENT_FIELDS, RecentTickets
+from search_index import InvertedIndex
+from ticket_index import (
+    StatusOrderIndex, TicketIndex, email_domain, format_ticket_id, normalize_ticket_id, ticket_number
+)
+
+TICKETS_DB = "tickets_data.db"
+
+# Jumlah maksimum entri change log sebelum entri lama dibuang
+MAX_CHANGE_LOG = 100000
+
+# Jumlah tiket per potongan saat iterasi (export)
+ITER_CHUNK_SIZE = 1000
+
+# Jumlah komentar per halaman di bagian komentar tiket
+COMMENT_PAGE_SIZE = 20
+
+TICKET_FIELDS = [
+    'id', 'name', 'email', 'phone', 'category', 'priority', 'department',
+    'subject', 'description', 'status', 'created_at', 'updated_at', 'assigned_to'
+]
+
+
+class ConflictError(Exception):
+    """Tiket sudah diubah sesi/proses lain sejak versi yang dilihat pengguna"""
+
+    def __init__(self, ticket_id, version):
+        super().__init__(f"Tiket {ticket_id} sudah diubah (versi sekarang {version})")
+        self.ticket_id = ticket_id
+        self.version = version
+
+
+class DuplicateTicketError(Exception):
+    """ID tiket baru sudah dipakai tiket lain"""
+
+    def __init__(self, ticket_id):
+        super().__init__(f"ID tiket {ticket_id} sudah dipakai")
+        self.ticket_id = ticket_id
+
+
+def mutation(method):
+    """Menserialisasi penulisan dan menaikkan `version` setelah berhasil"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            result = method(self, *args, **kwargs)
+            self.version += 1
+            return result
+    return wrapper
+
+
+class TicketRepository:
+    """Antarmuka penyimpanan tiket yang dipakai oleh app.py
+
+    Satu instance dipakai bersama oleh semua sesi Streamlit dalam satu proses
+    (lihat app.py). Penulisan diserialisasi oleh `_write_lock`, dan `version`
+    naik di setiap perubahan sehingga cache turunan (statistik, analitik)
+    tahu kapan harus diperbarui.
+
+    Pencarian kata kunci (inverted index), statistik jumlah tiket
+    (TicketMetrics), dan tiket terbaru (RecentTickets) dilayani dari struktur
+    di memori yang dibangun sekali saat repository dibuat dan diperbarui di
+    setiap mutasi.
+
+    Beberapa proses (replika) boleh memakai data yang sama. Setiap tiket
+    punya nomor `version` yang naik di setiap update/komentar; update dan
+    add_comment dengan `expected_version` ditolak (ConflictError) jika tiket
+    sudah diubah pihak lain. Perubahan dari proses lain diterapkan ke struktur
+    di memori oleh sync() dan sebelum setiap mutasi.
+
+    Tiket yang dikembalikan (all, get, filter_page, pencarian) hanya berisi
+    header tanpa komentar. Komentar disimpan terpisah per tiket dan dibaca
+    per halaman lewat comments(); with_comments() menggabungkan keduanya
+    untuk export.
+    """
+
+    def __init__(self):
+        self._write_lock = threading.RLock()
+        self.version = 0
+        # ID tiket yang dibuat/diubah, berurutan; dibaca oleh cache turunan
+        # (lihat analytics.py) lewat changes_since()
+        self._change_log = []
+        self._change_offset = 0
+
+    def _build_indexes(self):
+        self.search_index = InvertedIndex()
+        self.metrics = TicketMetrics()
+        self.recent_tickets = RecentTickets(creation_order_key, refill=self._recent_from_store)
+        for ticket in self.all():
+            self._index_new_ticket(ticket)
+        for ticket_id, text in self._comment_texts():
+            self.search_index.add(ticket_id, text)
+        self._change_log = []
+
+    def _record_change(self, ticket_id):
+        self._change_log.append(ticket_id)
+        if len(self._change_log) > MAX_CHANGE_LOG:
+            dropped = len(self._change_log) // 2
+            del self._change_log[:dropped]
+            self._change_offset += dropped
+
+    def changes_since(self, position):
+        """ID tiket yang berubah sejak `position`, beserta posisi terbaru.
+
+        Mengembalikan None sebagai daftar ID jika `position` sudah terlalu lama
+        (entrinya sudah dibuang), sehingga pemanggil harus membangun ulang.
+        """
+        with self._write_lock:
+            end = self._change_offset + len(self._change_log)
+            if position < self._change_offset:
+                return None, end
+            return self._change_log[position - self._change_offset:], end
+
+    def events_since(self, position):
+        """Event riwayat tiket (lihat events.py) setelah `position`, beserta posisi terbaru"""
+        raise NotImplementedError
+
+    def _index_new_ticket(self, ticket):
+        self.search_index.add_ticket(ticket)
+        self.metrics.on_create(ticket)
+        self.recent_tickets.add(ticket)
+        self._record_change(ticket['id'])
+
+    def _index_update(self, ticket, old_values, fields):
+        """`ticket` minimal berisi id dan created_at beserta nilai barunya"""
+        self.metrics.on_update(old_values, fields)
+        self.recent_tickets.on_update(ticket, old_values)
+        self._record_change(ticket['id'])
+
+    def _comment_texts(self):
+        """(ticket_id, teks) semua komentar, untuk membangun index pencarian"""
+        raise NotImplementedError
+
+    def memory_structures(self):
+        """Struktur data di memori per nama, untuk profiler.measure_memory()"""
+        return {
+            'search_index': self.search_index,
+            'metrics': self.metrics,
+            'recent_tickets': self.recent_tickets,
+            'change_log': self._change_log,
+        }
+
+    def close(self):
+        """Melepas koneksi dan pekerjaan background; repository tidak dipakai lagi setelahnya"""
+
+    def all(self):
+        """Header semua tiket (tanpa komentar), untuk analitik"""
+        raise NotImplementedError
+
+    def get(self, ticket_id):
+        """Satu tiket berdasarkan ID (tidak peka huruf besar/kecil), atau None"""
+        raise NotImplementedError
+
+    def get_many(self, ticket_ids):
+        """Tiket untuk daftar ID, dengan urutan yang sama"""
+        raise NotImplementedError
+
+    def comments(self, ticket_id, offset=0, limit=COMMENT_PAGE_SIZE):
+        """Satu halaman komentar tiket (terlama lebih dulu), mulai komentar ke-`offset`"""
+        raise NotImplementedError
+
+    def count_comments(self, ticket_id):
+        """Jumlah komentar tiket"""
+        raise NotImplementedError
+
+    def with_comments(self, tickets):
+        """Salinan `tickets` dengan field 'comments' berisi semua komentarnya (untuk export)"""
+        raise NotImplementedError
+
+    def create(self, ticket):
+        """Menyimpan tiket baru; field 'comments' (jika ada) dipindahkan ke penyimpanan komentar.
+
+        Melempar DuplicateTicketError jika ID-nya sudah dipakai.
+        """
+        raise NotImplementedError
+
+    def update(self, ticket_id, fields, expected_version=None):
+        """Mengubah field tiket; mengembalikan versi baru, atau None jika tiket tidak ada.
+
+        Melempar ConflictError jika `expected_version` diberikan dan berbeda
+        dengan versi tiket saat ini.
+        """
+        raise NotImplementedError
+
+    def add_comment(self, ticket_id, comment, updated_at, expected_version=None):
+        """Menambahkan komentar; versi baru dikembalikan seperti update()"""
+        raise NotImplementedError
+
+    def sync(self):
+        """Menerapkan perubahan yang ditulis proses lain ke struktur di memori"""
+        raise NotImplementedError
+
+    def filter_page(self, statuses, priorities, categories, cursor=None, limit=25):
+        """Satu halaman tiket yang cocok dengan filter, terbaru lebih dulu.
+
+        `cursor` adalah creation_order_key tiket terakhir di halaman sebelumnya
+        (keyset pagination), atau None untuk halaman pertama.
+        """
+        raise NotImplementedError
+
+    def count_filtered(self, statuses, priorities, categories):
+        """Jumlah tiket yang cocok dengan filter"""
+        raise NotImplementedError
+
+    def find_by_email(self, query):
+        """Tiket berdasarkan prefix email atau prefix domain ("@example.com")"""
+        raise NotImplementedError
+
+    def search_keyword(self, keyword, limit=None):
+        """Tiket yang subjek, deskripsi, atau komentarnya memuat semua kata kunci,
+        diurutkan berdasarkan relevansi (BM25)"""
+        return self.get_many(self.search_index.search(keyword, limit))
+
+    def recent(self, limit, field=None, value=None):
+        """`limit` tiket terbaru, opsional hanya dengan status/prioritas tertentu"""
+        return self.get_many(self.recent_tickets.latest(limit, field, value))
+
+    def _recent_from_store(self, field, value, limit):
+        """Query langsung ke penyimpanan untuk mengisi ulang RecentTickets"""
+        raise NotImplementedError
+
+    def count(self):
+        return self.metrics.total
+
+    def count_by(self, field):
+        """Dict nilai -> jumlah tiket untuk status, priority, category, atau department"""
+        return self.metrics.count_by(field)
+
+    def allocate_ticket_id(self):
+        """Mengalokasikan ID tiket baru dari sequence persisten (tidak pernah berulang)"""
+        return self.allocate_ticket_ids(1)[0]
+
+    def allocate_ticket_ids(self, count):
+        """Mengalokasikan `count` ID tiket baru berurutan dalam satu operasi sequence"""
+        raise NotImplementedError
+
+    def reserve_ticket_number(self, number):
+        """Memastikan ID yang dialokasikan berikutnya lebih besar dari nomor `number`"""
+        raise NotImplementedError
+
+    def import_tickets(self, tickets, events=None):
+        """Menyimpan banyak tiket sekaligus dalam satu penulisan (migrasi / import).
+
+        Tiket dengan ID yang sudah ada dilewati; tiket yang benar-benar baru
+        dikembalikan. `events` adalah riwayat yang sudah ada untuk tiket
+        tersebut; jika None, riwayat diperkirakan dengan backfill_events().
+        """
+        raise NotImplementedError
+
+    def iter_tickets(self, statuses=None, start=None, end=None, chunk_size=ITER_CHUNK_SIZE):
+        """Tiket per potongan (list) berukuran maksimal `chunk_size`, untuk export.
+
+        `statuses` None berarti semua status. `start` (inklusif) dan `end`
+        (eksklusif) adalah batas created_at dalam format timestamp tiket.
+        """
+        raise NotImplementedError
+
+    def export_tickets(self):
+        """Data tiket dalam format JSON (list of dict), termasuk komentar"""
+        return self.with_comments(self.all())
+
+
+def _events_for_import(new_tickets, events):
+    if events is None:
+        return [event for ticket in new_tickets for event in backfill_events(ticket)]
+    new_ids = {ticket['id'] for ticket in new_tickets}
+    return [event for event in events if event['ticket_id'] in new_ids]
+
+
+def _pop_comments(tickets):
+    """Melepas field 'comments' dari tiket (tersisa header); mengembalikan list (ticket_id, komentar)"""
+    return [(t['id'], comment) for t in tickets for comment in t.pop('comments', None) or []]
+
+
+def creation_order_key(ticket):
+    """Kunci urutan pembuatan: created_at, lalu nomor ID untuk waktu yang sama.
+
+    Untuk Ticket (JsonTicketRepository) created_at berupa detik epoch, jadi
+    cursor halaman hanya dibandingkan dengan kunci dari repository yang sama.
+    """
+    if isinstance(ticket, Ticket):
+        return ticket.creation_key()
+    return (ticket['created_at'], ticket_number(ticket['id']))
+
+
+class JsonTicketRepository(TicketRepository):
+    """Repository di memori dengan persistensi journal JSON
+
+    Lookup ID dan email memakai TicketIndex, sehingga mencari atau mengubah
+    satu tiket tidak perlu menelusuri seluruh list. Setiap mutasi dilakukan di
+    bawah storage.journal_lock() setelah membaca record journal dari proses
+    lain, sehingga pengecekan versi dan penulisan bersifat atomik antar proses.
+
+    Di memori hanya disimpan header tiket (sebagai models.Ticket) dan offset
+    byte komentar per tiket di storage.COMMENTS_FILE; teks komentar dibaca
+    dari file saat diminta. Filter dan pengurutan membandingkan kode status/
+    prioritas/kategori dan detik epoch langsung, tanpa mengubahnya ke string.
+    """
+
+    def __init__(self):
+        super().__init__()
+        with storage.journal_lock():
+            self.events, self._events_offset = storage.read_events_since(0)
+            self._reload()
+            if self.tickets and not self.events:
+                # Data dari sebelum riwayat dicatat: buat event perkiraan sekali saja
+                self._append_events(_events_for_import(self.with_comments(self.tickets), None))
+
+    def _reload(self):
+        """Memuat semua tiket dan komentar dari disk (dipanggil dengan journal lock)"""
+        tickets, self._journal_position = storage.load_state()
+        for ticket in tickets:
+            ticket.setdefault('version', 1)
+        inline_comments = _pop_comments(tickets)
+        # Diganti di tempat agar dict asal bisa dibebaskan satu per satu
+        for position, ticket in enumerate(tickets):
+            tickets[position] = Ticket.from_dict(ticket)
+        self.tickets = tickets
+        self.index = TicketIndex(self.tickets)
+        self._build_indexes()
+        if inline_comments:
+            self._migrate_comments(inline_comments)
+
+    def _migrate_comments(self, inline_comments):
+        """Memindahkan komentar inline (data versi lama) ke file komentar.
+
+        Komentar yang sudah ada di file komentar tidak ditulis ulang. Snapshot
+        lalu ditulis ulang tanpa komentar.
+        """
+        stored = {ticket_id: len(offsets) for ticket_id, offsets in self._comment_offsets.items()}
+        missing = []
+        for ticket_id, comment in inline_comments:
+            if stored.get(ticket_id, 0) > 0:
+                stored[ticket_id] -= 1
+            else:
+                missing.append((ticket_id, comment))
+        self._store_comments(missing)
+        self._journal_position = storage.save_tickets([ticket.to_dict() for ticket in self.tickets])
+
+    def _comment_texts(self):
+        self._comment_offsets = {}
+        records, self._comments_offset = storage.read_comments_since(0)
+        for offset, record in records:
+            self._comment_offsets.setdefault(record['ticket_id'], []).append(offset)
+            yield record['ticket_id'], record['text']
+
+    def _store_comments(self, comments):
+        """Menulis (ticket_id, komentar) ke file komentar dan index (dipanggil dengan journal lock)"""
+        if not comments:
+            return
+        self._catch_up_comments()
+        offsets, self._comments_offset = storage.append_comments(
+            [{'ticket_id': ticket_id, **comment} for ticket_id, comment in comments]
+        )
+        for offset, (ticket_id, comment) in zip(offsets, comments):
+            self._comment_offsets.setdefault(ticket_id, []).append(offset)
+            self.search_index.add(ticket_id, comment['text'])
+
+    def _catch_up_comments(self):
+        records, self._comments_offset = storage.read_comments_since(self._comments_offset)
+        for offset, record in records:
+            self._comment_offsets.setdefault(record['ticket_id'], []).append(offset)
+            self.search_index.add(record['ticket_id'], record['text'])
+            self._record_change(record['ticket_id'])
+
+    def _append_events(self, events):
+        self._events_offset = storage.append_events(events)
+        self.events.extend(events)
+
+    def _catch_up(self):
+        """Menerapkan record journal dan event dari proses lain (dipanggil dengan journal lock)"""
+        records, position = storage.read_journal_since(self._journal_position)
+        if records is None:
+            # Journal yang belum terbaca sudah dipadatkan: muat ulang dari snapshot
+            end = self._change_offset + len(self._change_log)
+            self._reload()
+            # Posisi change log lama tidak berlaku; pembaca harus membangun ulang
+            self._change_offset = end + 1
+        else:
+            for record in records:
+                self._apply_record(record)
+            self._journal_position = position
+            self._catch_up_comments()
+        events, self._events_offset = storage.read_events_since(self._events_offset)
+        self.events.extend(events)
+
+    def _apply_record(self, record):
+        op = record.get('op')
+        if op == 'create':
+            ticket = record['ticket']
+            if ticket['id'] not in self.index:
+                ticket.setdefault('version', 1)
+                ticket.pop('comments', None)
+                ticket = Ticket.from_dict(ticket)
+                self.tickets.append(ticket)
+                self.index.add(ticket)
+                self._index_new_ticket(ticket)
+        elif op == 'update':
+            ticket = self.index.get(record['id'])
+            if ticket is not None:
+                fields = record['fields']
+                old_values = {field: ticket.get(field) for field in fields}
+                ticket.update(fields)
+                self._index_update(ticket, old_values, fields)
+
+    def sync(self):
+        with self._write_lock, storage.journal_lock():
+            self._catch_up()
+
+    def close(self):
+        # Compaction background memakai path relatif terhadap direktori kerja saat ini
+        storage.wait_for_compaction()
+
+    def events_since(self, position):
+        with self._write_lock:
+            return self.events[position:], len(self.events)
+
+    def _build_indexes(self):
+        # Dibangun sekaligus setelah index lain, bukan insort per tiket
+        self.status_order = None
+        super()._build_indexes()
+        self.status_order = StatusOrderIndex(
+            (ticket['status'], ticket.creation_key(), ticket['id']) for ticket in self.tickets
+        )
+
+    def _index_new_ticket(self, ticket):
+        super()._index_new_ticket(ticket)
+        if self.status_order is not None:
+            self.status_order.add(ticket['status'], ticket.creation_key(), ticket['id'])
+
+    def _index_update(self, ticket, old_values, fields):
+        super()._index_update(ticket, old_values, fields)
+        status_changed = 'status' in old_values and old_values['status'] != ticket['status']
+        created_changed = 'created_at' in old_values and old_values['created_at'] != ticket['created_at']
+        if status_changed or created_changed:
+            key = ticket.creation_key()
+            old_key = key
+            if created_changed:
+                created = to_epoch(old_values['created_at'])
+                old_key = (created if created.__class__ is int else 0, key[1])
+            self.status_order.remove(old_values.get('status', ticket['status']), old_key, ticket['id'])
+            self.status_order.add(ticket['status'], key, ticket['id'])
+
+    def memory_structures(self):
+        return {
+            'tickets': self.tickets,
+            'ticket_index': self.index,
+            'status_order': self.status_order,
+            'comment_offsets': self._comment_offsets,
+            'events': self.events,
+            **super().memory_structures(),
+        }
+
+    def all(self):
+        return self.tickets
+
+    def get(self, ticket_id):
+        return self.index.get(ticket_id)
+
+    def get_many(self, ticket_ids):
+        tickets = (self.index.get(ticket_id) for ticket_id in ticket_ids)
+        return [ticket for ticket in tickets if ticket is not None]
+
+    def _offsets(self, ticket_id):
+        ticket = self.index.get(ticket_id)
+        return self._comment_offsets.get(ticket['id'], []) if ticket is not None else []
+
+    def comments(self, ticket_id, offset=0, limit=COMMENT_PAGE_SIZE):
+        return storage.read_comments_at(self._offsets(ticket_id)[offset:offset + limit])
+
+    def count_comments(self, ticket_id):
+        return len(self._offsets(ticket_id))
+
+    def with_comments(self, tickets):
+        return [
+            {**ticket, 'comments': storage.read_comments_at(self._comment_offsets.get(ticket['id']))}
+            for ticket in tickets
+        ]
+
+    def _locked_ticket(self, ticket_id, expected_version):
+        """Tiket terbaru untuk dimutasi (dipanggil dengan journal lock), cek versi"""
+        self._catch_up()
+        ticket = self.index.get(ticket_id)
+        if ticket is not None and expected_version is not None and ticket['version'] != expected_version:
+            raise ConflictError(ticket['id'], ticket['version'])
+        return ticket
+
+    @mutation
+    def create(self, ticket):
+        ticket.setdefault('version', 1)
+        events = [created_event(ticket)]
+        comments = _pop_comments([ticket])
+        stored = Ticket.from_dict(ticket)
+        with storage.journal_lock():
+            self._catch_up()
+            if stored['id'] in self.index:
+                raise DuplicateTicketError(stored['id'])
+            self.tickets.append(stored)
+            self.index.add(stored)
+            self._journal_position = storage.append_create(ticket)
+            self._append_events(events)
+            self._index_new_ticket(stored)
+            self._store_comments(comments)
+
+    @mutation
+    def update(self, ticket_id, fields, expected_version=None):
+        with storage.journal_lock():
+            ticket = self._locked_ticket(ticket_id, expected_version)
+            if ticket is None:
+                return None
+            fields = {**fields, 'version': ticket['version'] + 1}
+            old_values = {field: ticket.get(field) for field in fields}
+            ticket.update(fields)
+            self._journal_position = storage.append_update(ticket['id'], fields)
+            if 'status' in fields and old_values['status'] != fields['status']:
+                self._append_events([status_event(
+                    ticket['id'], fields.get('updated_at') or now_timestamp(), old_values['status'], fields['status']
+                )])
+        self._index_update(ticket, old_values, fields)
+        return ticket['version']
+
+    @mutation
+    def add_comment(self, ticket_id, comment, updated_at, expected_version=None):
+        with storage.journal_lock():
+            ticket = self._locked_ticket(ticket_id, expected_version)
+            if ticket is None:
+                return None
+            ticket_id = ticket['id']
+            # Komentar lebih dulu: jika proses mati di antaranya, versi tiket belum naik
+            self._store_comments([(ticket_id, comment)])
+            fields = {'updated_at': updated_at, 'version': ticket['version'] + 1}
+            ticket.update(fields)
+            self._journal_position = storage.append_update(ticket_id, fields)
+            self._append_events([comment_event(ticket_id, comment)])
+        self._record_change(ticket_id)
+        return ticket['version']
+
+    def _accept(self, priorities, categories):
+        """Penyaring ID tiket menurut prioritas dan kategori, atau None jika semua nilai dipilih"""
+        # Dibandingkan sebagai kode Vocabulary (atribut Ticket), tanpa decode per tiket
+        priority_codes = VOCABULARIES['priority'].codes(priorities)
+        category_codes = VOCABULARIES['category'].codes(categories)
+        if (len(priority_codes) == len(VOCABULARIES['priority'].values)
+                and len(category_codes) == len(VOCABULARIES['category'].values)):
+            return None
+        get = self.index.get
+
+        def accept(ticket_id):
+            ticket = get(ticket_id)
+            return ticket.priority in priority_codes and ticket.category in category_codes
+        return accept
+
+    def filter_page(self, statuses, priorities, categories, cursor=None, limit=25):
+        # Per status dibaca mundur dari cursor di status_order, lalu digabung;
+        # biayanya sebanding dengan tiket yang diperiksa, bukan jumlah semua tiket
+        accept = self._accept(priorities, categories)
+        entries = []
+        for status in dict.fromkeys(statuses):
+            entries.extend(self.status_order.newest(status, limit, cursor, accept))
+        return [self.index.get(ticket_id) for _, ticket_id in heapq.nlargest(limit, entries)]
+
+    def count_filtered(self, statuses, priorities, categories):
+        statuses = dict.fromkeys(statuses)
+        accept = self._accept(priorities, categories)
+        if accept is None:
+            return sum(self.status_order.count(status) for status in statuses)
+        # Filter prioritas/kategori: O(tiket berstatus terpilih)
+        return sum(
+            1 for status in statuses for ticket_id in self.status_order.ticket_ids(status) if accept(ticket_id)
+        )
+
+    def iter_tickets(self, statuses=None, start=None, end=None, chunk_size=ITER_CHUNK_SIZE):
+        # Tiket yang ditambahkan selama iterasi tidak ikut diexport
+        total = len(self.tickets)
+        status_codes = None if statuses is None else VOCABULARIES['status'].codes(statuses)
+        start_epoch = None if start is None else to_epoch(start)
+        end_epoch = None if end is None else to_epoch(end)
+        # Batas atau created_at dengan format lain dibandingkan sebagai string seperti semula
+        epoch_bounds = (start is None or start_epoch is not None) and (end is None or end_epoch is not None)
+        chunk = []
+        for position in range(total):
+            ticket = self.tickets[position]
+            if status_codes is not None and ticket.status not in status_codes:
+                continue
+            created = ticket.created_at
+            if epoch_bounds and created.__class__ is int:
+                low, high = start_epoch, end_epoch
+            else:
+                created, low, high = ticket['created_at'], start, end
+            if (low is not None and created < low) or (high is not None and created >= high):
+                continue
+            chunk.append(ticket)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def find_by_email(self, query):
+        return self.get_many(self.index.ids_by_email(query))
+
+    def _recent_from_store(self, field, value, limit):
+        tickets = self.tickets
+        if field is not None:
+            codes = VOCABULARIES[field].codes([value])
+            tickets = (t for t in tickets if getattr(t, field) in codes)
+        return heapq.nlargest(limit, tickets, key=Ticket.creation_key)
+
+    def allocate_ticket_ids(self, count):
+        first = storage.allocate_ticket_number(
+            lambda: max((ticket_number(t['id']) for t in self.tickets), default=0), count
+        )
+        return [format_ticket_id(number) for number in range(first, first + count)]
+
+    def reserve_ticket_number(self, number):
+        storage.bump_ticket_sequence(
+            number, lambda: max((ticket_number(t['id']) for t in self.tickets), default=0)
+        )
+
+    @mutation
+    def import_tickets(self, tickets, events=None):
+        new_tickets = []
+        with storage.journal_lock():
+            self._catch_up()
+            # ID yang muncul dua kali di batch yang sama hanya disimpan sekali
+            seen = set()
+            for ticket in tickets:
+                ticket_id = normalize_ticket_id(ticket['id'])
+                if ticket_id not in seen and ticket_id not in self.index:
+                    seen.add(ticket_id)
+                    ticket.setdefault('version', 1)
+                    new_tickets.append(ticket)
+            if new_tickets:
+                new_events = _events_for_import(new_tickets, events)
+                comments = _pop_comments(new_tickets)
+                self._journal_position = storage.append_creates(new_tickets)
+                self._append_events(new_events)
+                for ticket in new_tickets:
+                    stored = Ticket.from_dict(ticket)
+                    self.tickets.append(stored)
+                    self.index.add(stored)
+                    self._index_new_ticket(stored)
+                self._store_comments(comments)
+        self.reserve_ticket_number(max((ticket_number(t['id']) for t in tickets), default=0))
+        return new_tickets
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL COLLATE NOCASE,
+    email_domain TEXT NOT NULL COLLATE NOCASE,
+    phone TEXT,
+    category TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    department TEXT,
+    subject TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    assigned_to TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    attachments TEXT,
+    number INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_email ON tickets(email);
+CREATE INDEX IF NOT EXISTS idx_tickets_email_domain ON tickets(email_domain);
+CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
+CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets(category);
+CREATE INDEX IF NOT EXISTS idx_tickets_department ON tickets(department);
+
+CREATE TABLE IF NOT EXISTS comments (
+    ticket_id TEXT NOT NULL REFERENCES tickets(id),
+    position INTEGER NOT NULL,
+    author TEXT NOT NULL,
+    text TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (ticket_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS ticket_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id TEXT NOT NULL,
+    at TEXT NOT NULL,
+    type TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT,
+    author TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ticket_events_ticket ON ticket_events(ticket_id);
+
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Index urutan pembuatan, dibuat setelah kolom number dipastikan ada (database
+# lama). Kolom number = nomor urut dari ID ("TKT-1000" -> 1000), sehingga
+# urutan benar setelah TKT-999 dan ORDER BY bisa dibaca langsung dari index.
+ORDER_INDEXES = """
+DROP INDEX IF EXISTS idx_tickets_status;
+DROP INDEX IF EXISTS idx_tickets_created_at;
+CREATE INDEX IF NOT EXISTS idx_tickets_created ON tickets(created_at, number);
+CREATE INDEX IF NOT EXISTS idx_tickets_status_created ON tickets(status, created_at, number);
+CREATE INDEX IF NOT EXISTS idx_tickets_filter ON tickets(status, priority, category);
+"""
+
+_NEWEST_FIRST = "ORDER BY created_at DESC, number DESC"
+_OLDEST_FIRST = "ORDER BY created_at, number"
+
+# Kolom tiket yang disimpan: field tiket + nomor versi (optimistic concurrency)
+# + referensi lampiran (list JSON, lihat attachments.py)
+_STORED_FIELDS = TICKET_FIELDS + ['version', 'attachments']
+_COLUMNS = ", ".join(_STORED_FIELDS)
+_EVENT_COLUMNS = ", ".join(EVENT_FIELDS)
+_INSERT_EVENT = (
+    f"INSERT INTO ticket_events ({_EVENT_COLUMNS}) "
+    f"VALUES ({', '.join('?' for _ in EVENT_FIELDS)})"
+)
+_INSERT_NEW_TICKET = (
+    f"INSERT INTO tickets ({_COLUMNS}, email_domain, number) "
+    f"VALUES ({', '.join('?' for _ in _STORED_FIELDS)}, ?, ?)"
+)
+# Import/migrasi: ID yang sudah ada dilewati
+_INSERT_TICKET = _INSERT_NEW_TICKET.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+
+
+def _ticket_row(ticket):
+    attachments = ticket.get('attachments')
+    return (
+        tuple(ticket.get(field) for field in TICKET_FIELDS)
+        + (ticket.get('version', 1), json.dumps(attachments) if attachments else None, email_domain(ticket['email']))
+        + (ticket_number(ticket['id']),)
+    )
+
+
+def _row_ticket(row):
+    ticket = {field: row[field] for field in _STORED_FIELDS}
+    ticket['attachments'] = json.loads(ticket['attachments']) if ticket['attachments'] else []
+    return ticket
+
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+
+class SqliteTicketRepository(TicketRepository):
+    """Repository SQLite (mode WAL) dengan index di kolom yang sering difilter
+
+    Penulisan memakai transaksi BEGIN IMMEDIATE (lihat _transaction), yang
+    menserialisasi penulis antar proses. Perubahan dari proses lain dibaca
+    dari tabel ticket_events dan comments (seq/rowid setelah posisi terakhir)
+    untuk memperbarui index di memori.
+    """
+
+    def __init__(self, path=TICKETS_DB):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        # Semua koneksi per thread, agar close() bisa menutupnya dari thread mana pun
+        self._connections = []
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(tickets)")}
+            if 'version' not in columns:
+                # Database dari sebelum tiket punya nomor versi
+                conn.execute("ALTER TABLE tickets ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            if 'attachments' not in columns:
+                conn.execute("ALTER TABLE tickets ADD COLUMN attachments TEXT")
+            if 'number' not in columns:
+                conn.execute("ALTER TABLE tickets ADD COLUMN number INTEGER")
+                conn.execute("UPDATE tickets SET number = CAST(substr(id, 5) AS INTEGER)")
+            for statement in ORDER_INDEXES.strip().split(";")[:-1]:
+                conn.execute(statement)
+            if not conn.execute("SELECT 1 FROM ticket_events LIMIT 1").fetchone():
+                # Data dari sebelum riwayat dicatat: buat event perkiraan sekali saja
+                self._insert_events(conn, _events_for_import(self.with_comments(self.all()), None))
+        # Index di memori dan posisi sync dibaca dari snapshot database yang sama
+        conn.execute("BEGIN")
+        with conn:
+            self._event_seq, self._comment_rowid = self._sync_marks(conn)
+            self._build_indexes()
+
+    def _sync_marks(self, conn):
+        return (
+            conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ticket_events").fetchone()[0],
+            conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM comments").fetchone()[0]
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """Transaksi tulis yang lebih dulu menerapkan perubahan proses lain"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            self._catch_up(conn)
+            yield conn
+            self._event_seq, self._comment_rowid = self._sync_marks(conn)
+
+    def _catch_up(self, conn):
+        """Memperbarui index di memori dengan tulisan proses lain (dipanggil dalam transaksi)"""
+        events = conn.execute(
+            f"SELECT seq, {_EVENT_COLUMNS} FROM ticket_events WHERE seq > ? ORDER BY seq",
+            (self._event_seq,)
+        ).fetchall()
+        comments = conn.execute(
+            "SELECT rowid, ticket_id, text FROM comments WHERE rowid > ? ORDER BY rowid",
+            (self._comment_rowid,)
+        ).fetchall()
+        if not events and not comments:
+            return
+        # Tiket baru dibaca dalam keadaan terkini (termasuk statusnya)
+        created = [row['ticket_id'] for row in events if row['type'] == EVENT_CREATED]
+        for ticket in self.get_many(created):
+            self._index_new_ticket(ticket)
+        created = set(created)
+        status_changes = [
+            row for row in events if row['type'] == EVENT_STATUS and row['ticket_id'] not in created
+        ]
+        if status_changes:
+            ids = list({row['ticket_id'] for row in status_changes})
+            created_at = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                created_at.update(conn.execute(
+                    f"SELECT id, created_at FROM tickets WHERE id IN ({_placeholders(chunk)})", chunk
+                ).fetchall())
+            for row in status_changes:
+                ticket = {'id': row['ticket_id'], 'created_at': created_at.get(row['ticket_id']), 'status': row['to_status']}
+                self._index_update(ticket, {'status': row['from_status']}, {'status': row['to_status']})
+        for row in comments:
+            self.search_index.add(row['ticket_id'], row['text'])
+            self._record_change(row['ticket_id'])
+        if events:
+            self._event_seq = events[-1]['seq']
+        if comments:
+            self._comment_rowid = comments[-1]['rowid']
+
+    def sync(self):
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN")
+            with conn:
+                self._catch_up(conn)
+
+    def _insert_events(self, conn, events):
+        conn.executemany(
+            _INSERT_EVENT, [tuple(event.get(field) for field in EVENT_FIELDS) for event in events]
+        )
+
+    def events_since(self, position):
+        rows = self._conn().execute(
+            f"SELECT seq, {_EVENT_COLUMNS} FROM ticket_events WHERE seq > ? ORDER BY seq", (position,)
+        ).fetchall()
+        events = [{field: row[field] for field in EVENT_FIELDS} for row in rows]
+        return events, (rows[-1]['seq'] if rows else position)
+
+    def _conn(self):
+        # Streamlit menjalankan tiap sesi di thread berbeda; satu koneksi per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._write_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._write_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def _select(self, where="", params=(), order=_NEWEST_FIRST, limit=None):
+        sql = f"SELECT {_COLUMNS} FROM tickets {where} {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [_row_ticket(row) for row in self._conn().execute(sql, params)]
+
+    def _comment_texts(self):
+        return self._conn().execute("SELECT ticket_id, text FROM comments ORDER BY rowid")
+
+    def comments(self, ticket_id, offset=0, limit=COMMENT_PAGE_SIZE):
+        # Posisi komentar berurutan dari 0, jadi halaman dibaca lewat primary key
+        rows = self._conn().execute(
+            "SELECT author, text, timestamp FROM comments "
+            "WHERE ticket_id = ? AND position >= ? ORDER BY position LIMIT ?",
+            (normalize_ticket_id(ticket_id), offset, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def count_comments(self, ticket_id):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM comments WHERE ticket_id = ?", (normalize_ticket_id(ticket_id),)
+        ).fetchone()[0]
+
+    def with_comments(self, tickets):
+        tickets = [{**ticket, 'comments': []} for ticket in tickets]
+        by_id = {ticket['id']: ticket for ticket in tickets}
+        # Batas parameter SQLite: ambil komentar per potongan ID
+        ids = list(by_id)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in self._conn().execute(
+                f"SELECT ticket_id, author, text, timestamp FROM comments "
+                f"WHERE ticket_id IN ({_placeholders(chunk)}) ORDER BY ticket_id, position",
+                chunk
+            ):
+                by_id[row['ticket_id']]['comments'].append({
+                    'author': row['author'],
+                    'text': row['text'],
+                    'timestamp': row['timestamp']
+                })
+        return tickets
+
+    def all(self):
+        return self._select(order=_OLDEST_FIRST)
+
+    def get(self, ticket_id):
+        result = self._select("WHERE id = ?", (normalize_ticket_id(ticket_id),), order="")
+        return result[0] if result else None
+
+    def get_many(self, ticket_ids):
+        by_id = {}
+        for start in range(0, len(ticket_ids), 500):
+            chunk = ticket_ids[start:start + 500]
+            for ticket in self._select(f"WHERE id IN ({_placeholders(chunk)})", chunk, order=""):
+                by_id[ticket['id']] = ticket
+        return [by_id[ticket_id] for ticket_id in ticket_ids if ticket_id in by_id]
+
+    @mutation
+    def create(self, ticket):
+        ticket.setdefault('version', 1)
+        events = [created_event(ticket)]
+        comments = _pop_comments([ticket])
+        with self._transaction() as conn:
+            try:
+                conn.execute(_INSERT_NEW_TICKET, _ticket_row(ticket))
+            except sqlite3.IntegrityError as exc:
+                if 'tickets.id' not in str(exc):
+                    raise
+                raise DuplicateTicketError(ticket['id'])
+            self._insert_comments(conn, comments)
+            self._insert_events(conn, events)
+        self._index_new_ticket(ticket)
+        self._index_comments(comments)
+
+    def _insert_comments(self, conn, comments):
+        """Menyimpan (ticket_id, komentar) untuk tiket baru, posisi mulai dari 0 per tiket"""
+        positions = {}
+        rows = []
+        for ticket_id, c in comments:
+            position = positions.get(ticket_id, 0)
+            positions[ticket_id] = position + 1
+            rows.append((ticket_id, position, c['author'], c['text'], c['timestamp']))
+        conn.executemany(
+            "INSERT OR IGNORE INTO comments (ticket_id, position, author, text, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _index_comments(self, comments):
+        for ticket_id, comment in comments:
+            self.search_index.add(ticket_id, comment['text'])
+
+    def _locked_row(self, conn, ticket_id, expected_version, columns=()):
+        """Baris tiket untuk dimutasi (dalam transaksi tulis), cek versi"""
+        row = conn.execute(
+            f"SELECT {', '.join(['id', 'created_at', 'version', *columns])} FROM tickets WHERE id = ?",
+            (normalize_ticket_id(ticket_id),)
+        ).fetchone()
+        if row is not None and expected_version is not None and row['version'] != expected_version:
+            raise ConflictError(row['id'], row['version'])
+        return row
+
+    @mutation
+    def update(self, ticket_id, fields, expected_version=None):
+        columns = [field for field in fields if field in TICKET_FIELDS and field != 'id']
+        assignments = ", ".join([f"{column} = ?" for column in columns] + ["version = version + 1"])
+        with self._transaction() as conn:
+            row = self._locked_row(conn, ticket_id, expected_version, columns)
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE tickets SET {assignments} WHERE id = ?",
+                [fields[column] for column in columns] + [row['id']]
+            )
+            if 'status' in columns and row['status'] != fields['status']:
+                self._insert_events(conn, [status_event(
+                    row['id'], fields.get('updated_at') or now_timestamp(), row['status'], fields['status']
+                )])
+        old_values = {column: row[column] for column in columns}
+        ticket = {'id': row['id'], 'created_at': row['created_at'], **fields}
+        self._index_update(ticket, old_values, fields)
+        return row['version'] + 1
+
+    @mutation
+    def add_comment(self, ticket_id, comment, updated_at, expected_version=None):
+        with self._transaction() as conn:
+            row = self._locked_row(conn, ticket_id, expected_version)
+            if row is None:
+                return None
+            ticket_id = row['id']
+            conn.execute(
+                "INSERT INTO comments (ticket_id, position, author, text, timestamp) "
+                "SELECT ?, COALESCE(MAX(position) + 1, 0), ?, ?, ? FROM comments WHERE ticket_id = ?",
+                (ticket_id, comment['author'], comment['text'], comment['timestamp'], ticket_id)
+            )
+            conn.execute(
+                "UPDATE tickets SET updated_at = ?, version = version + 1 WHERE id = ?", (updated_at, ticket_id)
+            )
+            self._insert_events(conn, [comment_event(ticket_id, comment)])
+        self.search_index.add(ticket_id, comment['text'])
+        self._record_change(ticket_id)
+        return row['version'] + 1
+
+    def _filter_where(self, statuses, priorities, categories):
+        where = (
+            f"WHERE status IN ({_placeholders(statuses)}) "
+            f"AND priority IN ({_placeholders(priorities)}) "
+            f"AND category IN ({_placeholders(categories)})"
+        )
+        return where, list(statuses) + list(priorities) + list(categories)
+
+    def filter_page(self, statuses, priorities, categories, cursor=None, limit=25):
+        if not statuses or not priorities or not categories:
+            return []
+        # Satu query per status: urutan dibaca dari index (status, created_at,
+        # number) tanpa sort, lalu hasil per status digabung
+        tickets = []
+        for status in dict.fromkeys(statuses):
+            where, params = self._filter_where([status], priorities, categories)
+            if cursor is not None:
+                where += " AND (created_at, number) < (?, ?)"
+                params += list(cursor)
+            tickets.extend(self._select(where, params, limit=limit))
+        return heapq.nlargest(limit, tickets, key=creation_order_key)
+
+    def count_filtered(self, statuses, priorities, categories):
+        if not statuses or not priorities or not categories:
+            return 0
+        where, params = self._filter_where(statuses, priorities, categories)
+        return self._conn().execute(f"SELECT COUNT(*) FROM tickets {where}", params).fetchone()[0]
+
+    def iter_tickets(self, statuses=None, start=None, end=None, chunk_size=ITER_CHUNK_SIZE):
+        if statuses is not None and not statuses:
+            return
+        conditions, params = [], []
+        if statuses is not None:
+            conditions.append(f"status IN ({_placeholders(statuses)})")
+            params += list(statuses)
+        if start is not None:
+            conditions.append("created_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("created_at < ?")
+            params.append(end)
+        cursor = None
+        while True:
+            # Keyset per potongan: tidak ada statement terbuka di antara yield
+            where, where_params = list(conditions), list(params)
+            if cursor is not None:
+                created_at, number = cursor
+                where.append("(created_at, number) > (?, ?)")
+                where_params += [created_at, number]
+            chunk = self._select(
+                f"WHERE {' AND '.join(where)}" if where else "", where_params,
+                order=_OLDEST_FIRST, limit=chunk_size
+            )
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            cursor = creation_order_key(chunk[-1])
+
+    def find_by_email(self, query):
+        query = query.strip()
+        column = 'email'
+        if query.startswith('@'):
+            column, query = 'email_domain', query[1:]
+        # LIKE dengan prefix memakai index karena kolom email COLLATE NOCASE
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return self._select(f"WHERE {column} LIKE ? ESCAPE '\\'", (escaped + '%',))
+
+    def _recent_from_store(self, field, value, limit):
+        if field is None:
+            return self._select(limit=limit)
+        if field not in RECENT_FIELDS:
+            raise ValueError(f"Field tidak didukung: {field}")
+        return self._select(f"WHERE {field} = ?", (value,), limit=limit)
+
+    def allocate_ticket_ids(self, count):
+        conn = self._conn()
+        # BEGIN IMMEDIATE mengambil write lock database, jadi alokasi bersifat
+        # atomik antar sesi maupun antar proses
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO sequences (name, value) "
+                "SELECT 'ticket', COALESCE(MAX(number), 0) FROM tickets"
+            )
+            conn.execute("UPDATE sequences SET value = value + ? WHERE name = 'ticket'", (count,))
+            last = conn.execute("SELECT value FROM sequences WHERE name = 'ticket'").fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [format_ticket_id(number) for number in range(last - count + 1, last + 1)]
+
+    def reserve_ticket_number(self, number):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO sequences (name, value) "
+                "SELECT 'ticket', COALESCE(MAX(number), 0) FROM tickets"
+            )
+            conn.execute("UPDATE sequences SET value = MAX(value, ?) WHERE name = 'ticket'", (number,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @mutation
+    def import_tickets(self, tickets, events=None):
+        new_tickets = []
+        with self._transaction() as conn:
+            # ID yang muncul dua kali di batch yang sama hanya disimpan sekali
+            seen = set()
+            for ticket in tickets:
+                ticket_id = normalize_ticket_id(ticket['id'])
+                if ticket_id in seen:
+                    continue
+                seen.add(ticket_id)
+                ticket['id'] = ticket_id
+                ticket.setdefault('version', 1)
+                # rowcount 0: ID sudah ada di database (INSERT OR IGNORE)
+                if conn.execute(_INSERT_TICKET, _ticket_row(ticket)).rowcount:
+                    new_tickets.append(ticket)
+            new_events = _events_for_import(new_tickets, events)
+            comments = _pop_comments(new_tickets)
+            self._insert_comments(conn, comments)
+            self._insert_events(conn, new_events)
+            # Sequence (jika sudah ada) tidak boleh tertinggal dari ID hasil import
+            conn.execute(
+                "UPDATE sequences SET value = MAX(value, ?) WHERE name = 'ticket'",
+                (max((ticket_number(t['id']) for t in new_tickets), default=0),)
+            )
+        for ticket in new_tickets:
+            self._index_new_ticket(ticket)
+        self._index_comments(comments)
+        return new_tickets
+
+
+def migrate_json_to_sqlite(repo):
+    """Migrasi satu kali: salin tickets_data.json (+ journal) ke SQLite jika DB masih kosong"""
+    if repo.count() > 0:
+        return 0
+    if not (os.path.exists(storage.TICKETS_FILE) or os.path.exists(storage.JOURNAL_FILE)):
+        return 0
+    tickets = storage.load_tickets()
+    comments = storage.load_comments()
+    for ticket in tickets:
+        # Komentar di file komentar, atau inline untuk data versi lama
+        ticket['comments'] = comments.get(ticket['id']) or ticket.get('comments') or []
+    repo.import_tickets(tickets, storage.load_events() or None)
+    return len(tickets)
+
+
+def get_repository():
+    """Membuat repository sesuai TICKETS_BACKEND (default: sqlite)"""
+    backend = os.environ.get("TICKETS_BACKEND", "sqlite").lower()
+    if backend == "json":
+        return JsonTicketRepository()
+    repo = SqliteTicketRepository(os.environ.get("TICKETS_DB", TICKETS_DB))
+    migrate_json_to_sqlite(repo)
+    return repo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/export data tiket")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Migrasi tickets_data.json ke SQLite")
+    import_parser = sub.add_parser("import", help="Import tiket massal dari file JSON/NDJSON/CSV")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["json", "ndjson", "csv"],
+                               help="Default: dari ekstensi file")
+    import_parser.add_argument("--batch-size", type=int, help="Jumlah record per batch tulis")
+    import_parser.add_argument("--rejects", help="Simpan record yang ditolak ke file NDJSON ini")
+    export_parser = sub.add_parser("export", help="Export tiket ke file JSON/CSV/NDJSON/Parquet")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", default="json", choices=["json", "csv", "ndjson", "parquet"])
+    export_parser.add_argument("--status", action="append", help="Hanya status ini (boleh diulang)")
+    export_parser.add_argument("--from", dest="start_date", type=date.fromisoformat,
+                               help="Tanggal dibuat mulai (YYYY-MM-DD)")
+    export_parser.add_argument("--to", dest="end_date", type=date.fromisoformat,
+                               help="Tanggal dibuat sampai (YYYY-MM-DD, inklusif)")
+    args = parser.parse_args()
+
+    repo = get_repository()
+    if args.command == "migrate":
+        print(f"{repo.count()} tiket tersedia di {TICKETS_DB}")
+    elif args.command == "import":
+        # importer mengimpor repository, jadi diimpor di sini
+        from importer import IMPORT_BATCH_SIZE, import_file
+        rejects = open(args.rejects, 'w', encoding='utf-8') if args.rejects else None
+
+        def on_reject(number, record, error):
+            if rejects is not None:
+                rejects.write(json.dumps({'record': number, 'error': error, 'data': record}, ensure_ascii=False) + "\n")
+
+        def on_batch(report):
+            print(f"  {report.read} record dibaca ({report.throughput:,.0f} record/detik)", flush=True)
+
+        try:
+            report = import_file(
+                repo, args.path, args.format, batch_size=args.batch_size or IMPORT_BATCH_SIZE,
+                on_reject=on_reject, on_batch=on_batch
+            )
+        finally:
+            if rejects is not None:
+                rejects.close()
+        print(report.summary())
+        for reject in report.rejects[:20]:
+            print(f"  record {reject['record']}: {reject['error']}")
+        print(f"Import selesai, total {repo.count()} tiket")
+    else:
+        # exporter mengimpor repository, jadi diimpor di sini
+        from exporter import write_export
+        with open(args.path, 'wb') as f:
+            write_export(
+                repo, f, args.format, statuses=args.status,
+                start_date=args.start_date, end_date=args.end_date
+            )
+        print(f"Export selesai ke {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Resource bersama (st.cache_resource) untuk semua sesi dalam satu proses server.
+
+Dipakai oleh app.py dan modul halaman di views/, sehingga data tiket dan
+engine analitik hanya dimuat sekali per proses, bukan per sesi atau per
+halaman.
+"""
+
+import streamlit as st
+
+import profiler
+from repository import get_repository
+from sla import SlaScheduler
+
+
+@st.cache_resource
+def get_shared_repository():
+    """Repository bersama untuk semua sesi dalam satu proses server (tanpa salinan per sesi)"""
+    return get_repository()
+
+
+@st.cache_resource
+def get_analytics():
+    """Engine analitik bersama; frame diperbarui inkremental mengikuti repository"""
+    # Engine analitik (pandas) baru dimuat saat halaman yang memerlukannya dibuka
+    from analytics import TicketAnalytics
+    return TicketAnalytics(get_shared_repository())
+
+
+@st.cache_resource
+def get_sla_scheduler():
+    """Scheduler SLA bersama; thread background-nya hanya berjalan satu per proses server"""
+    return SlaScheduler(get_shared_repository()).start()
+
+
+@st.cache_resource
+def get_profile_history():
+    """Riwayat profil rerun bersama untuk semua sesi dalam satu proses"""
+    return profiler.ProfileHistory()
+
+
+def measure_store_memory(repo):
+    """Perkiraan memori repository dan engine analitik, disimpan di riwayat profil"""
+    structures = {
+        **repo.memory_structures(),
+        **get_analytics().memory_structures(),
+        **get_sla_scheduler().memory_structures(),
+    }
+    get_profile_history().set_memory(profiler.measure_memory(structures))
+
+
+def release_shared_resources():
+    """Menghentikan scheduler SLA, menutup repository bersama, lalu mengosongkan cache resource.
+
+    Hanya berlaku di dalam script Streamlit (misal lewat AppTest): di luar
+    konteks script, cache_resource selalu membuat objek baru.
+    """
+    get_sla_scheduler().stop()
+    get_shared_repository().close()
+    st.cache_resource.clear()
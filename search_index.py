@@ -0,0 +1,127 @@
+"""Inverted index full-text untuk pencarian "Kata Kunci".
+
+Subjek, deskripsi, dan teks komentar dipecah menjadi token lalu disimpan di
+posting list (term -> {ticket_id: frekuensi}). Index diperbarui secara
+inkremental saat tiket dibuat atau dikomentari, sehingga pencarian tidak
+perlu membaca ulang seluruh teks tiket.
+
+Query terdiri dari beberapa kata yang digabung dengan AND. Kata dengan
+minimal tiga huruf dicocokkan sebagai prefix ("log" cocok dengan "login"),
+dan hasil diurutkan dengan skor BM25.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Kata yang lebih pendek dari ini dicocokkan persis, bukan sebagai prefix,
+# agar query seperti "a" tidak mengembang ke ribuan term
+MIN_PREFIX_LENGTH = 3
+
+# Parameter standar BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Memecah teks menjadi token huruf kecil"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def ticket_text(ticket):
+    """Teks yang diindex dari header tiket: subjek dan deskripsi.
+
+    Teks komentar ditambahkan terpisah ke dokumen yang sama lewat add().
+    """
+    return " ".join([ticket.get('subject', ''), ticket.get('description', '')])
+
+
+class InvertedIndex:
+    """Inverted index dengan prefix matching dan ranking BM25"""
+
+    def __init__(self):
+        self._postings = {}
+        # Daftar term terurut untuk mencari semua term dengan prefix tertentu
+        self._terms = []
+        self._doc_lengths = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def add(self, ticket_id, text):
+        """Menambahkan teks ke dokumen `ticket_id` (dokumen baru atau komentar baru)"""
+        tokens = tokenize(text)
+        with self._lock:
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._terms, token)
+                postings[ticket_id] = postings.get(ticket_id, 0) + 1
+            self._doc_lengths[ticket_id] = self._doc_lengths.get(ticket_id, 0) + len(tokens)
+            self._total_length += len(tokens)
+
+    def add_ticket(self, ticket):
+        self.add(ticket['id'], ticket_text(ticket))
+
+    def _expand(self, prefix):
+        """Semua term di index yang diawali `prefix`"""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return [prefix] if prefix in self._postings else []
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\U0010ffff")
+        return self._terms[start:end]
+
+    def search(self, query, limit=None):
+        """ID tiket yang cocok dengan semua kata di `query`, terurut skor BM25"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs
+            expansions = [
+                [self._postings[expanded] for expanded in self._expand(term)]
+                for term in terms
+            ]
+            # Kata yang paling selektif diproses lebih dulu agar kandidat cepat menyusut
+            expansions.sort(key=lambda lists: sum(len(postings) for postings in lists))
+            scores = None
+            for posting_lists in expansions:
+                term_scores = {}
+                for postings in posting_lists:
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    if scores is not None and len(scores) < len(postings):
+                        # Cukup cek kandidat yang tersisa, bukan seluruh posting list
+                        matches = ((ticket_id, postings[ticket_id]) for ticket_id in scores if ticket_id in postings)
+                    else:
+                        matches = postings.items()
+                    for ticket_id, tf in matches:
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[ticket_id] / avg_length)
+                        score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        # Untuk prefix yang cocok dengan beberapa term, ambil skor terbaik
+                        if score > term_scores.get(ticket_id, 0.0):
+                            term_scores[ticket_id] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        ticket_id: score + term_scores[ticket_id]
+                        for ticket_id, score in scores.items()
+                        if ticket_id in term_scores
+                    }
+                if not scores:
+                    return []
+        if limit is not None:
+            return heapq.nsmallest(limit, scores, key=lambda ticket_id: (-scores[ticket_id], ticket_id))
+        return sorted(scores, key=lambda ticket_id: (-scores[ticket_id], ticket_id))
@@ -0,0 +1,250 @@
+"""Pemantauan SLA tiket aktif di background, satu scheduler per proses server.
+
+Tiket berstatus Open/In Progress punya tenggat SLA: created_at + target jam
+menurut prioritas dan kategori (SLA_HOURS, CATEGORY_SLA_HOURS). Setiap
+tiket menaruh dua titik waktu di heap (priority queue) berurutan waktu:
+saat tiket mulai "berisiko" (sisa waktu <= AT_RISK_FRACTION dari target)
+dan saat tenggatnya terlewati. Thread scheduler hanya mengambil entri yang
+sudah jatuh tempo dari puncak heap dan tiket yang berubah lewat
+repo.changes_since(), sehingga biaya per event O(log n) dan rerun tidak
+pernah menelusuri seluruh tiket.
+
+Tiket yang berubah dijadwalkan ulang dengan generation baru; entri heap
+lamanya diabaikan saat diambil (lazy deletion). Tiket yang melewati SLA
+dicatat sebagai eskalasi ke logger "tickets.sla" dan tampil di antrean
+"Berisiko SLA" di Dashboard bersama tiket yang mendekati tenggat.
+"""
+
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+from models import TIMESTAMP_FORMAT, from_epoch, to_epoch
+
+ACTIVE_STATUSES = ['Open', 'In Progress']
+
+# Target penyelesaian (jam) per prioritas
+SLA_HOURS = {'High': 4, 'Medium': 24, 'Low': 72}
+# Target khusus (prioritas, kategori), menggantikan SLA_HOURS
+CATEGORY_SLA_HOURS = {('High', 'Teknis'): 2, ('High', 'Akun'): 2}
+# Target untuk prioritas di luar SLA_HOURS (misal dari data import)
+DEFAULT_SLA_HOURS = 72
+
+# Tiket dianggap berisiko jika sisa waktunya <= fraksi ini dari target
+AT_RISK_FRACTION = 0.25
+
+# Interval maksimum thread scheduler memeriksa perubahan tiket (detik)
+POLL_SECONDS = 5
+
+STATE_AT_RISK = 'at_risk'
+STATE_BREACHED = 'breached'
+
+logger = logging.getLogger("tickets.sla")
+
+
+def sla_hours(priority, category):
+    return CATEGORY_SLA_HOURS.get((priority, category), SLA_HOURS.get(priority, DEFAULT_SLA_HOURS))
+
+
+def sla_deadline(ticket):
+    """(tenggat, mulai berisiko) dalam detik epoch, atau None jika tiket tidak dipantau"""
+    if ticket.get('status') not in ACTIVE_STATUSES:
+        return None
+    created = to_epoch(ticket.get('created_at'))
+    if created is None:
+        return None
+    target = int(sla_hours(ticket.get('priority'), ticket.get('category')) * 3600)
+    return created + target, created + target - int(target * AT_RISK_FRACTION)
+
+
+def now_epoch():
+    return to_epoch(datetime.now().strftime(TIMESTAMP_FORMAT))
+
+
+class SlaScheduler:
+    """Heap tenggat SLA dan antrean tiket berisiko, diperbarui oleh thread background"""
+
+    def __init__(self, repo, poll_seconds=POLL_SECONDS):
+        self.repo = repo
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        # Entri heap: (waktu, generation, state, ticket_id)
+        self._heap = []
+        self._generations = itertools.count()
+        # ticket_id -> (generation, tenggat, mulai berisiko)
+        self._tracked = {}
+        # Antrean berisiko: list terurut (tenggat, ticket_id), terlama lewat lebih dulu
+        self._queue = []
+        # ticket_id -> (state, tenggat) untuk tiket di antrean
+        self._flags = {}
+        self._counts = Counter()
+        # Tiket yang sudah dieskalasi; perubahan tiket tidak memicu eskalasi ulang
+        self._escalated = set()
+        self._position = 0
+        self._ready = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Memulai thread scheduler (sekali per proses, lihat resources.get_sla_scheduler)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sla-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Menghentikan thread scheduler dan menunggu pemeriksaan yang sedang berjalan selesai"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                wait = self.poll()
+            except Exception:
+                logger.exception("Pemeriksaan SLA gagal")
+                wait = self.poll_seconds
+            self._stop.wait(wait)
+
+    def poll(self):
+        """Menerapkan perubahan tiket dan tenggat yang sudah lewat; mengembalikan detik sampai pemeriksaan berikutnya"""
+        self.repo.sync()
+        if not self._ready:
+            self._rebuild()
+        else:
+            changed, position = self.repo.changes_since(self._position)
+            if changed is None:
+                self._rebuild()
+            elif changed:
+                ticket_ids = list(dict.fromkeys(changed))
+                tickets = {ticket['id']: ticket for ticket in self.repo.get_many(ticket_ids)}
+                with self._lock:
+                    for ticket_id in ticket_ids:
+                        self._schedule(ticket_id, tickets.get(ticket_id))
+                self._position = position
+        now = now_epoch()
+        with self._lock:
+            self._advance(now)
+            if not self._heap:
+                return self.poll_seconds
+            return min(self.poll_seconds, max(0, self._heap[0][0] - now))
+
+    def _rebuild(self):
+        # Satu-satunya penelusuran penuh: saat start dan jika change log sudah terpotong
+        _, position = self.repo.changes_since(0)
+        tracked = {}
+        heap = []
+        for chunk in self.repo.iter_tickets(statuses=ACTIVE_STATUSES):
+            for ticket in chunk:
+                deadline = sla_deadline(ticket)
+                if deadline is not None:
+                    generation = next(self._generations)
+                    tracked[ticket['id']] = (generation, *deadline)
+                    heap.append((deadline[1], generation, STATE_AT_RISK, ticket['id']))
+                    heap.append((deadline[0], generation, STATE_BREACHED, ticket['id']))
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap = heap
+            self._tracked = tracked
+            self._queue = []
+            self._flags = {}
+            self._counts = Counter()
+            self._escalated = set()
+            self._position = position
+            self._advance(now_epoch(), escalate=False)
+        self._ready = True
+        if self._counts[STATE_BREACHED]:
+            logger.warning("%d tiket aktif sudah melewati SLA", self._counts[STATE_BREACHED])
+
+    def _schedule(self, ticket_id, ticket):
+        """Menjadwalkan ulang tiket yang berubah (None = tidak ada lagi); dipanggil dengan _lock"""
+        self._unflag(ticket_id)
+        deadline = None if ticket is None else sla_deadline(ticket)
+        if deadline is None:
+            self._tracked.pop(ticket_id, None)
+            self._escalated.discard(ticket_id)
+            return
+        generation = next(self._generations)
+        self._tracked[ticket_id] = (generation, *deadline)
+        heapq.heappush(self._heap, (deadline[1], generation, STATE_AT_RISK, ticket_id))
+        heapq.heappush(self._heap, (deadline[0], generation, STATE_BREACHED, ticket_id))
+        # Entri usang menumpuk jika tiket sering berubah sebelum tenggatnya
+        if len(self._heap) > 4 * len(self._tracked) + 1000:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [
+            entry for entry in self._heap
+            if self._tracked.get(entry[3], (None,))[0] == entry[1]
+        ]
+        heapq.heapify(self._heap)
+
+    def _advance(self, now, escalate=True):
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, generation, state, ticket_id = heapq.heappop(heap)
+            tracked = self._tracked.get(ticket_id)
+            if tracked is None or tracked[0] != generation:
+                continue
+            self._flag(ticket_id, state, tracked[1])
+            if state == STATE_BREACHED and ticket_id not in self._escalated:
+                self._escalated.add(ticket_id)
+                if escalate:
+                    logger.warning("Eskalasi: tiket %s melewati tenggat SLA %s", ticket_id, from_epoch(tracked[1]))
+
+    def _flag(self, ticket_id, state, deadline):
+        previous = self._flags.get(ticket_id)
+        if previous is None:
+            bisect.insort(self._queue, (deadline, ticket_id))
+        else:
+            self._counts[previous[0]] -= 1
+        self._flags[ticket_id] = (state, deadline)
+        self._counts[state] += 1
+
+    def _unflag(self, ticket_id):
+        previous = self._flags.pop(ticket_id, None)
+        if previous is None:
+            return
+        state, deadline = previous
+        self._counts[state] -= 1
+        position = bisect.bisect_left(self._queue, (deadline, ticket_id))
+        if position < len(self._queue) and self._queue[position] == (deadline, ticket_id):
+            del self._queue[position]
+
+    def at_risk(self, limit=None):
+        """Tiket berisiko/lewat SLA, tenggat terlama lebih dulu: dict id, state, deadline, remaining_seconds"""
+        now = now_epoch()
+        with self._lock:
+            entries = self._queue if limit is None else self._queue[:limit]
+            return [
+                {
+                    'id': ticket_id,
+                    'state': self._flags[ticket_id][0],
+                    'deadline': from_epoch(deadline),
+                    'remaining_seconds': deadline - now,
+                }
+                for deadline, ticket_id in entries
+            ]
+
+    def counts(self):
+        """Jumlah tiket per state (at_risk, breached) dan jumlah tiket aktif yang dipantau"""
+        with self._lock:
+            return {
+                STATE_AT_RISK: self._counts[STATE_AT_RISK],
+                STATE_BREACHED: self._counts[STATE_BREACHED],
+                'tracked': len(self._tracked),
+            }
+
+    @property
+    def ready(self):
+        """True setelah tiket aktif pertama kali dimuat ke heap"""
+        return self._ready
+
+    def memory_structures(self):
+        """Heap dan antrean SLA, untuk profiler.measure_memory()"""
+        return {'sla_heap': self._heap, 'sla_tracked': self._tracked, 'sla_queue': self._queue}
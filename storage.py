@@ -0,0 +1,525 @@
+"""Penyimpanan tiket berbasis snapshot + journal append-only.
+
+Setiap perubahan tiket (tiket baru, update status/assign/versi) ditulis sebagai
+satu baris JSON di akhir file journal, sehingga biaya tulis sebanding dengan
+ukuran perubahan, bukan ukuran seluruh data. Journal dipadatkan (compaction)
+ke file snapshot di background thread setelah jumlah record tertentu.
+
+Aman dipakai beberapa proses sekaligus (misal beberapa replika Streamlit di
+satu host): semua penulisan journal, snapshot, dan event dilakukan di bawah
+journal_lock() (flock antar proses). Setiap file journal diawali header
+ber-id unik, sehingga proses lain bisa membaca record baru sejak posisi
+terakhirnya (read_journal_since) dan tahu kapan journal sudah dipadatkan.
+Setiap compaction mencatat id dan offset akhir journal yang dipadatkan di
+COMPACTED_FILE (snapshot tetap berupa array JSON biasa), sehingga pembaca
+yang sudah sampai di akhir journal itu cukup lanjut ke journal berikutnya
+tanpa memuat ulang snapshot.
+
+Komentar disimpan terpisah dari tiket di file append-only COMMENTS_FILE (satu
+baris per komentar, dengan ticket_id), sehingga snapshot dan journal hanya
+berisi header tiket. Komentar dibaca per halaman lewat offset byte-nya
+(read_comments_at).
+"""
+
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+from profiler import span
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya lock antar thread
+    fcntl = None
+
+TICKETS_FILE = "tickets_data.json"
+JOURNAL_FILE = "tickets_data.journal"
+COMPACTING_FILE = JOURNAL_FILE + ".compacting"
+SEQUENCE_FILE = "tickets_data.seq"
+EVENTS_FILE = "tickets_data.events"
+COMMENTS_FILE = "tickets_data.comments"
+# Id dan offset akhir journal terakhir yang sudah dipadatkan ke snapshot
+COMPACTED_FILE = "tickets_data.compacted"
+
+# Jumlah record journal sebelum compaction dijalankan
+COMPACT_THRESHOLD = 1000
+
+# Nilai 'op' untuk baris pertama setiap file journal
+JOURNAL_HEADER = 'journal'
+
+_lock = threading.RLock()
+_compaction_thread = None
+_journal_records = 0
+# Jumlah file_lock yang sedang dipegang per path (hanya oleh thread pemegang _lock)
+_held_locks = {}
+
+
+def _read_snapshot():
+    """Membaca snapshot tiket (list of dict) dari file JSON"""
+    if os.path.exists(TICKETS_FILE):
+        with open(TICKETS_FILE, 'r', encoding='utf-8') as f, span("json_parse_snapshot"):
+            return json.load(f)
+    return []
+
+
+def _compacted_journal():
+    """(id, offset akhir) journal terakhir yang dipadatkan ke snapshot, atau None"""
+    try:
+        with open(COMPACTED_FILE, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return journal['id'], journal['end']
+
+
+def _write_compacted_journal(journal_id, end):
+    """Mencatat journal yang dipadatkan secara atomik (dipanggil dengan journal_lock)"""
+    tmp_path = f"{COMPACTED_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'id': journal_id, 'end': end}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, COMPACTED_FILE)
+
+
+def _write_tmp(tickets, tmp_path):
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(tickets, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_snapshot(tickets):
+    """Menulis snapshot secara atomik (file sementara + rename)"""
+    tmp_path = f"{TICKETS_FILE}.{os.getpid()}.tmp"
+    _write_tmp(tickets, tmp_path)
+    os.replace(tmp_path, TICKETS_FILE)
+
+
+def apply_mutation(index, tickets, record):
+    """Menerapkan satu record journal ke state tiket.
+
+    `index` adalah dict id -> tiket untuk list `tickets`. Semua operasi bersifat
+    idempoten sehingga replay ulang journal (misal setelah crash di tengah
+    compaction) tidak menggandakan data. Record header journal diabaikan.
+    """
+    op = record.get('op')
+    if op == 'create':
+        ticket = record['ticket']
+        if ticket['id'] not in index:
+            tickets.append(ticket)
+            index[ticket['id']] = ticket
+    elif op == 'update':
+        ticket = index.get(record['id'])
+        if ticket is not None:
+            ticket.update(record['fields'])
+    elif op == 'comment':
+        # Komentar inline dari journal versi lama; dipindahkan ke file komentar
+        # oleh repository saat dimuat
+        ticket = index.get(record['id'])
+        if ticket is not None:
+            comments = ticket.setdefault('comments', [])
+            # Komentar hanya ditambahkan jika posisinya belum terisi
+            if len(comments) == record['index']:
+                comments.append(record['comment'])
+            ticket['updated_at'] = record['updated_at']
+            if 'version' in record:
+                ticket['version'] = record['version']
+
+
+def _read_records(path, offset=0, with_offsets=False):
+    """Record JSON yang lengkap di `path` mulai byte `offset`, beserta offset akhirnya.
+
+    Dengan `with_offsets`, setiap record dikembalikan sebagai (offset, record).
+    """
+    records = []
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return records, offset
+    with f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Baris terakhir bisa terpotong jika proses mati saat menulis
+                break
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                records.append((offset, record) if with_offsets else record)
+            offset += len(line)
+    return records, offset
+
+
+def _replay(path, index, tickets):
+    """Replay file journal ke state, mengembalikan jumlah record dan offset akhir"""
+    records, offset = _read_records(path)
+    for record in records:
+        apply_mutation(index, tickets, record)
+    return len(records), offset
+
+
+def _journal_id(path):
+    """Id dari header journal; '' untuk journal lama tanpa header, None jika file tidak ada"""
+    try:
+        with open(path, 'rb') as f:
+            first = f.readline()
+    except FileNotFoundError:
+        return None
+    try:
+        record = json.loads(first)
+    except json.JSONDecodeError:
+        return ''
+    return record.get('id', '') if record.get('op') == JOURNAL_HEADER else ''
+
+
+def _new_journal():
+    """Membuat journal kosong ber-header id baru (dipanggil dengan journal_lock)"""
+    tmp_path = f"{JOURNAL_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'op': JOURNAL_HEADER, 'id': uuid.uuid4().hex}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, JOURNAL_FILE)
+
+
+def _truncate_partial_line(f):
+    """Membuang sisa baris terpotong di akhir file (record yang tidak pernah selesai ditulis)"""
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(0, position - 65536)
+        f.seek(start)
+        newline = f.read(position - start).rfind(b"\n")
+        if newline >= 0:
+            position = start + newline + 1
+            break
+        position = start
+    if position != end:
+        f.truncate(position)
+    f.seek(position)
+
+
+def _append_lines(path, lines):
+    """Menambahkan baris ke file append-only (satu kali tulis + fsync).
+
+    Dipanggil dengan journal_lock. Mengembalikan offset awal setiap baris dan
+    offset akhir file.
+    """
+    with open(path, 'ab'):
+        pass
+    with open(path, 'rb+') as f:
+        _truncate_partial_line(f)
+        offsets = []
+        position = f.tell()
+        data = []
+        for line in lines:
+            encoded = line.encode('utf-8')
+            offsets.append(position)
+            position += len(encoded)
+            data.append(encoded)
+        if data:
+            f.write(b"".join(data))
+            f.flush()
+            os.fsync(f.fileno())
+        return offsets, f.tell()
+
+
+def journal_lock():
+    """Lock antar proses untuk semua penulisan journal, snapshot, dan event"""
+    return file_lock(JOURNAL_FILE)
+
+
+def load_state():
+    """Memuat tiket dari snapshot + journal, beserta posisi journal untuk read_journal_since"""
+    global _journal_records
+    with journal_lock():
+        if _journal_id(JOURNAL_FILE) is None:
+            _new_journal()
+        tickets = _read_snapshot()
+        index = {t['id']: t for t in tickets}
+        with span("journal_replay"):
+            _replay(COMPACTING_FILE, index, tickets)
+            _journal_records, offset = _replay(JOURNAL_FILE, index, tickets)
+        return tickets, (_journal_id(JOURNAL_FILE), offset)
+
+
+def load_tickets():
+    """Memuat data tiket dari snapshot lalu replay journal di atasnya"""
+    return load_state()[0]
+
+
+def read_journal_since(position):
+    """Record journal yang ditulis (oleh proses mana pun) setelah `position`.
+
+    Dipanggil dengan journal_lock. Mengembalikan (records, posisi baru), atau
+    (None, None) jika record journal pada `position` yang belum terbaca sudah
+    dipadatkan ke snapshot sehingga pemanggil harus memuat ulang dengan
+    load_state().
+    """
+    journal_id, offset = position
+    current = _journal_id(JOURNAL_FILE)
+    if current == journal_id:
+        records, end = _read_records(JOURNAL_FILE, offset)
+        return records, (current, end)
+    if current is None:
+        return None, None
+    compacting = _journal_id(COMPACTING_FILE)
+    if compacting == journal_id:
+        # Journal lama sedang dipadatkan: sisa record-nya lalu isi journal baru
+        records, _ = _read_records(COMPACTING_FILE, offset)
+        new_records, end = _read_records(JOURNAL_FILE)
+        return records + new_records, (current, end)
+    if _compacted_journal() != (journal_id, offset):
+        return None, None
+    # Journal pada `position` sudah dipadatkan setelah dibaca sampai habis:
+    # lanjut dari awal journal berikutnya (yang mungkin sedang dipadatkan)
+    records = []
+    if compacting is not None:
+        records, _ = _read_records(COMPACTING_FILE)
+    new_records, end = _read_records(JOURNAL_FILE)
+    return records + new_records, (current, end)
+
+
+def save_tickets(tickets):
+    """Menyimpan seluruh data tiket sebagai snapshot baru dan mengosongkan journal.
+
+    Menimpa perubahan proses lain yang belum ada di `tickets`; penulisan
+    sehari-hari memakai fungsi append_* yang aman dipakai bersamaan.
+    Mengembalikan posisi journal baru (lihat read_journal_since).
+    """
+    global _journal_records
+    with journal_lock(), span("json_write_snapshot"):
+        # Snapshot ditulis ulang penuh: tidak ada journal yang bisa dilanjutkan
+        if os.path.exists(COMPACTED_FILE):
+            os.remove(COMPACTED_FILE)
+        _write_snapshot(tickets)
+        if os.path.exists(COMPACTING_FILE):
+            os.remove(COMPACTING_FILE)
+        _new_journal()
+        _journal_records = 0
+        return _journal_id(JOURNAL_FILE), os.path.getsize(JOURNAL_FILE)
+
+
+def _append(*records):
+    """Menambahkan record ke journal (satu kali tulis + fsync) dan memicu compaction bila perlu.
+
+    Mengembalikan posisi journal setelah record terakhir.
+    """
+    global _journal_records
+    lines = [json.dumps(record, ensure_ascii=False) + "\n" for record in records]
+    with journal_lock():
+        if _journal_id(JOURNAL_FILE) is None:
+            _new_journal()
+        _, end = _append_lines(JOURNAL_FILE, lines)
+        position = (_journal_id(JOURNAL_FILE), end)
+        _journal_records += len(records)
+        if _journal_records >= COMPACT_THRESHOLD:
+            compact_async()
+            # Journal dirotasi: record di atas ada di file .compacting, jadi
+            # penulis lanjut dari header journal baru (masih kosong, kita pegang lock)
+            journal_id = _journal_id(JOURNAL_FILE)
+            if journal_id != position[0]:
+                position = (journal_id, os.path.getsize(JOURNAL_FILE))
+        return position
+
+
+def append_create(ticket):
+    """Mencatat pembuatan tiket baru"""
+    return _append({'op': 'create', 'ticket': ticket})
+
+
+def append_creates(tickets):
+    """Mencatat banyak tiket baru sekaligus (import massal)"""
+    return _append(*({'op': 'create', 'ticket': ticket} for ticket in tickets))
+
+
+def append_update(ticket_id, fields):
+    """Mencatat perubahan field tiket (status, assigned_to, updated_at, ...)"""
+    return _append({'op': 'update', 'id': ticket_id, 'fields': fields})
+
+
+def _compact(compacting_id):
+    """Menggabungkan snapshot dengan journal yang sedang dipadatkan"""
+    tmp_path = f"{TICKETS_FILE}.{os.getpid()}.compact.tmp"
+    with journal_lock():
+        if _journal_id(COMPACTING_FILE) != compacting_id:
+            return
+        tickets = _read_snapshot()
+        index = {t['id']: t for t in tickets}
+        _, end = _replay(COMPACTING_FILE, index, tickets)
+    # Serialisasi (bagian paling mahal) dilakukan tanpa memegang lock
+    _write_tmp(tickets, tmp_path)
+    with journal_lock():
+        # Sudah diselesaikan proses lain, atau snapshot ditulis ulang penuh
+        if _journal_id(COMPACTING_FILE) != compacting_id:
+            os.remove(tmp_path)
+            return
+        # Penanda ditulis sebelum rename: jika proses mati di antaranya, file
+        # .compacting masih ada dan pembaca tetap membacanya lebih dulu
+        if compacting_id:
+            _write_compacted_journal(compacting_id, end)
+        os.replace(tmp_path, TICKETS_FILE)
+        os.remove(COMPACTING_FILE)
+
+
+def compact_async():
+    """Memulai compaction di background thread (tidak memblokir rerun Streamlit)"""
+    global _compaction_thread, _journal_records
+    with journal_lock():
+        if _compaction_thread is not None and _compaction_thread.is_alive():
+            return
+        # Journal lama dipindahkan; tulisan baru langsung masuk ke journal kosong.
+        # Jika file .compacting tertinggal (proses lain / crash), selesaikan dulu.
+        if not os.path.exists(COMPACTING_FILE):
+            records, _ = _read_records(JOURNAL_FILE)
+            if not any(record.get('op') != JOURNAL_HEADER for record in records):
+                return
+            os.replace(JOURNAL_FILE, COMPACTING_FILE)
+            _new_journal()
+            _journal_records = 0
+        _compaction_thread = threading.Thread(
+            target=_compact, args=(_journal_id(COMPACTING_FILE),), daemon=True
+        )
+        _compaction_thread.start()
+
+
+def wait_for_compaction():
+    """Menunggu compaction background (jika ada) selesai, misal sebelum mengukur waktu muat"""
+    thread = _compaction_thread
+    if thread is not None:
+        thread.join()
+
+
+@contextmanager
+def file_lock(path):
+    """Lock eksklusif antar thread dan antar proses (via file `<path>.lock`).
+
+    Reentrant di thread yang sama, sehingga fungsi yang memegang lock boleh
+    memanggil fungsi lain yang juga memakainya.
+    """
+    with _lock:
+        if _held_locks.get(path):
+            _held_locks[path] += 1
+            try:
+                yield
+            finally:
+                _held_locks[path] -= 1
+            return
+        with open(path + ".lock", 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            _held_locks[path] = 1
+            try:
+                yield
+            finally:
+                _held_locks[path] = 0
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read_sequence():
+    if not os.path.exists(SEQUENCE_FILE):
+        return None
+    with open(SEQUENCE_FILE, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    return int(content) if content else None
+
+
+def _write_sequence(value):
+    tmp_path = f"{SEQUENCE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(str(value))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SEQUENCE_FILE)
+
+
+def allocate_ticket_number(seed, count=1):
+    """Mengambil nomor tiket berikutnya dari sequence yang tersimpan di disk.
+
+    Aman dipakai bersamaan oleh beberapa sesi maupun proses. `seed` adalah
+    fungsi yang mengembalikan nomor terbesar yang sudah ada; hanya dipanggil
+    sekali saat file sequence belum ada. Dengan `count` > 1, satu blok nomor
+    berurutan dipesan sekaligus dan nomor pertamanya dikembalikan.
+    """
+    with file_lock(SEQUENCE_FILE):
+        current = _read_sequence()
+        if current is None:
+            current = seed()
+        _write_sequence(current + count)
+        return current + 1
+
+
+def bump_ticket_sequence(number, seed=None):
+    """Memastikan sequence tidak lebih kecil dari `number` (setelah import).
+
+    `seed` seperti pada allocate_ticket_number; tanpa `seed`, file sequence
+    yang belum ada langsung diisi `number`.
+    """
+    with file_lock(SEQUENCE_FILE):
+        stored = _read_sequence()
+        current = seed() if stored is None and seed is not None else stored
+        if current is None or current < number:
+            _write_sequence(number)
+        elif stored is None:
+            _write_sequence(current)
+
+
+def read_events_since(offset=0):
+    """Event riwayat tiket (lihat events.py) mulai byte `offset`, beserta offset akhirnya"""
+    return _read_records(EVENTS_FILE, offset)
+
+
+def load_events():
+    """Memuat semua event riwayat tiket (lihat events.py)"""
+    return read_events_since(0)[0]
+
+
+def append_events(events):
+    """Menambahkan event ke akhir file event (append-only); mengembalikan offset akhir file"""
+    with journal_lock():
+        return _append_lines(EVENTS_FILE, [json.dumps(event, ensure_ascii=False) + "\n" for event in events])[1]
+
+
+def read_comments_since(offset=0):
+    """Komentar mulai byte `offset` sebagai list (offset, record), beserta offset akhirnya.
+
+    Setiap record berisi ticket_id, author, text, dan timestamp.
+    """
+    return _read_records(COMMENTS_FILE, offset, with_offsets=True)
+
+
+def load_comments():
+    """Semua komentar sebagai dict ticket_id -> list komentar (urutan penulisan)"""
+    comments = {}
+    for _, record in read_comments_since(0)[0]:
+        comments.setdefault(record.pop('ticket_id'), []).append(record)
+    return comments
+
+
+def read_comments_at(offsets):
+    """Komentar (tanpa ticket_id) pada offset-offset byte hasil read_comments_since/append_comments"""
+    comments = []
+    if not offsets:
+        return comments
+    with open(COMMENTS_FILE, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            record = json.loads(f.readline())
+            record.pop('ticket_id', None)
+            comments.append(record)
+    return comments
+
+
+def append_comments(records):
+    """Menambahkan komentar (dict dengan ticket_id) ke file komentar.
+
+    Mengembalikan offset setiap komentar dan offset akhir file.
+    """
+    with journal_lock():
+        return _append_lines(COMMENTS_FILE, [json.dumps(record, ensure_ascii=False) + "\n" for record in records])
@@ -0,0 +1,142 @@
+"""Index di memori untuk lookup tiket berdasarkan ID dan email.
+
+- ID: dict dari ID ter-normalisasi ke tiket, lookup O(1)
+- Email: list terurut (email, id) dan (domain, email, id) sehingga pencarian
+  prefix email ("john") maupun domain ("@example.com") cukup O(log n) + hasil
+"""
+
+import bisect
+import threading
+
+# Batas atas untuk pencarian rentang prefix di list terurut
+_PREFIX_END = "\U0010ffff"
+
+
+def normalize_ticket_id(ticket_id):
+    """Menyamakan format ID tiket (" tkt-001 " -> "TKT-001")"""
+    return (ticket_id or '').strip().upper()
+
+
+def format_ticket_id(number):
+    """Nomor urut -> ID tiket. Minimal 3 digit, tanpa batas atas (TKT-001, TKT-1000)"""
+    return f"TKT-{number:03d}"
+
+
+def ticket_number(ticket_id):
+    """Nomor urut dari ID tiket, dipakai sebagai kunci urutan numerik.
+
+    Urutan string salah setelah TKT-999 ("TKT-1000" < "TKT-999"), jadi
+    pengurutan berdasarkan ID harus memakai nilai ini.
+    """
+    try:
+        return int(normalize_ticket_id(ticket_id).split('-', 1)[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def email_domain(email):
+    """Domain dari alamat email dalam huruf kecil ("" jika tidak valid)"""
+    return email.rsplit('@', 1)[-1].lower() if '@' in email else ''
+
+
+class TicketIndex:
+    """Hash index ID dan sorted index email/domain yang diperbarui setiap mutasi"""
+
+    def __init__(self, tickets=()):
+        self._by_id = {}
+        self._emails = []
+        self._domains = []
+        self._lock = threading.Lock()
+        for ticket in tickets:
+            self._by_id[normalize_ticket_id(ticket['id'])] = ticket
+        # Bangun list terurut sekaligus (O(n log n)) daripada insort satu per satu
+        self._emails = sorted((t['email'].lower(), t['id']) for t in self._by_id.values())
+        self._domains = sorted((email_domain(email), email, ticket_id) for email, ticket_id in self._emails)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, ticket_id):
+        return normalize_ticket_id(ticket_id) in self._by_id
+
+    def add(self, ticket):
+        """Mendaftarkan tiket baru ke semua index"""
+        key = normalize_ticket_id(ticket['id'])
+        email = ticket['email'].lower()
+        with self._lock:
+            if key in self._by_id:
+                return
+            self._by_id[key] = ticket
+            bisect.insort(self._emails, (email, ticket['id']))
+            bisect.insort(self._domains, (email_domain(email), email, ticket['id']))
+
+    def get(self, ticket_id):
+        return self._by_id.get(normalize_ticket_id(ticket_id))
+
+    def ids_by_email(self, query):
+        """ID tiket dengan email berawalan `query`, atau berdomain `query` jika diawali '@'
+
+        Domain juga dicocokkan sebagai prefix, jadi "@example" cocok dengan
+        "example.com" dan "example.co.id".
+        """
+        query = query.strip().lower()
+        with self._lock:
+            if query.startswith('@'):
+                prefix = query[1:]
+                start = bisect.bisect_left(self._domains, (prefix,))
+                end = bisect.bisect_left(self._domains, (prefix + _PREFIX_END,))
+                return [ticket_id for _, _, ticket_id in self._domains[start:end]]
+            start = bisect.bisect_left(self._emails, (query,))
+            end = bisect.bisect_left(self._emails, (query + _PREFIX_END,))
+            return [ticket_id for _, ticket_id in self._emails[start:end]]
+
+
+class StatusOrderIndex:
+    """List terurut (kunci pembuatan, id) per status untuk filter dan keyset pagination.
+
+    Halaman "terbaru lebih dulu" dibaca mundur dari posisi cursor (O(log n) +
+    tiket yang diperiksa), bukan dengan mengurutkan semua tiket yang cocok.
+    """
+
+    def __init__(self, entries=()):
+        self._by_status = {}
+        self._lock = threading.Lock()
+        for status, key, ticket_id in entries:
+            self._by_status.setdefault(status, []).append((key, ticket_id))
+        for items in self._by_status.values():
+            items.sort()
+
+    def add(self, status, key, ticket_id):
+        with self._lock:
+            bisect.insort(self._by_status.setdefault(status, []), (key, ticket_id))
+
+    def remove(self, status, key, ticket_id):
+        with self._lock:
+            items = self._by_status.get(status, [])
+            position = bisect.bisect_left(items, (key, ticket_id))
+            if position < len(items) and items[position] == (key, ticket_id):
+                del items[position]
+
+    def count(self, status):
+        return len(self._by_status.get(status, ()))
+
+    def ticket_ids(self, status):
+        """Semua ID tiket berstatus `status` (urutan pembuatan)"""
+        with self._lock:
+            return [ticket_id for _, ticket_id in self._by_status.get(status, ())]
+
+    def newest(self, status, limit, before=None, accept=None):
+        """Maksimal `limit` (kunci, id) terbaru berstatus `status` dengan kunci < `before`.
+
+        `accept(ticket_id)` (opsional) menyaring tiket, misal menurut prioritas.
+        """
+        result = []
+        with self._lock:
+            items = self._by_status.get(status, [])
+            position = len(items) if before is None else bisect.bisect_left(items, (tuple(before),))
+            while position > 0 and len(result) < limit:
+                position -= 1
+                entry = items[position]
+                if accept is None or accept(entry[1]):
+                    result.append(entry)
+        return result
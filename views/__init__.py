@@ -0,0 +1,29 @@
+"""Halaman aplikasi, satu modul per menu navigasi.
+
+app.py hanya merender sidebar lalu memanggil render(). Modul halaman beserta
+dependensinya (analytics/pandas, exporter, importer) baru di-import saat
+halaman itu pertama kali dibuka, sehingga cold start dan rerun halaman
+ringan seperti "Buat Tiket Baru" tidak ikut membayar biaya halaman lain.
+Setiap modul halaman punya fungsi render(repo).
+"""
+
+import importlib
+
+from profiler import span
+
+# Menu navigasi -> modul halaman, urut seperti di sidebar
+VIEWS = {
+    "Dashboard": "views.dashboard",
+    "Buat Tiket Baru": "views.create_ticket",
+    "Daftar Tiket": "views.ticket_list",
+    "Cari Tiket": "views.search",
+    "Analitik": "views.analytics",
+}
+DEFAULT_VIEW = "Dashboard"
+
+
+def render(view, repo):
+    """Merender halaman `view` (nama menu navigasi)"""
+    with span("import_view"):
+        module = importlib.import_module(VIEWS[view])
+    module.render(repo)
@@ -0,0 +1,63 @@
+"""Panel admin tersembunyi di sidebar (buka app dengan ?admin=1).
+
+Menampilkan profil rerun terakhir, riwayat rerun, dan perkiraan memori
+struktur data tiket (lihat profiler.py).
+"""
+
+import pandas as pd
+import streamlit as st
+
+import profiler
+from attachments import format_size
+from resources import get_profile_history, measure_store_memory
+
+
+def render_panel(repo, last_profile):
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("🛠️ Admin: Profiling"):
+            st.toggle(
+                "Profiling sesi ini",
+                key='profiling',
+                value=profiler.env_enabled(),
+                disabled=profiler.env_enabled(),
+                help=f"Selalu aktif jika {profiler.PROFILE_ENV}=1"
+            )
+            
+            if last_profile is not None:
+                st.markdown(f"**Rerun terakhir ({last_profile.view}): {last_profile.total * 1000:.1f} ms**")
+                rows = [
+                    {'Bagian': "· " * entry['depth'] + entry['name'], 'ms': round(entry['seconds'] * 1000, 2)}
+                    for entry in last_profile.spans
+                ]
+                rows.append({'Bagian': "render widget & lainnya", 'ms': round(last_profile.untracked_seconds() * 1000, 2)})
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            else:
+                st.caption("Aktifkan profiling untuk mengukur rerun berikutnya.")
+            
+            records, _, memory = get_profile_history().snapshot()
+            if records:
+                st.markdown("**Rerun sebelumnya**")
+                st.dataframe(
+                    pd.DataFrame(
+                        [{'Waktu': r['timestamp'], 'Halaman': r['view'], 'ms': r['total_ms']} for r in reversed(records)]
+                    ),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            if st.button("📏 Ukur memori", use_container_width=True):
+                measure_store_memory(repo)
+                memory = get_profile_history().snapshot()[2]
+            if memory:
+                st.markdown(f"**Memori data tiket: {format_size(memory['total'])}**")
+                st.dataframe(
+                    pd.DataFrame([
+                        {'Komponen': name, 'Ukuran': format_size(size)}
+                        for name, size in sorted(memory['components'].items(), key=lambda item: -item[1])
+                    ]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                if memory['rss'] is not None:
+                    st.caption(f"RSS proses: {format_size(memory['rss'])} · diukur dalam {memory['measured_in_ms']:.0f} ms")
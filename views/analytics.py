@@ -0,0 +1,145 @@
+"""Halaman "Analitik": distribusi, waktu respons/resolusi, dan export data"""
+
+import io
+
+import pandas as pd
+import streamlit as st
+
+from exporter import EXPORT_FORMATS, write_export
+from models import STATUSES
+from profiler import span
+from resources import get_analytics
+
+
+def render(repo):
+    st.title("📊 Analitik & Laporan")
+    
+    if repo.count():
+        analytics = get_analytics()
+        
+        # Time-based analytics
+        st.subheader("📅 Analisis Berdasarkan Waktu")
+        
+        tickets_per_day = analytics.daily_volume()
+        
+        st.line_chart(tickets_per_day)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🎯 Distribusi Kategori")
+            category_counts = pd.Series(repo.count_by('category'))
+            st.bar_chart(category_counts)
+        
+        with col2:
+            st.subheader("⚡ Distribusi Prioritas")
+            priority_counts = pd.Series(repo.count_by('priority'))
+            st.bar_chart(priority_counts)
+        
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📈 Status Tiket")
+            status_counts = pd.Series(repo.count_by('status'))
+            st.bar_chart(status_counts)
+        
+        with col2:
+            st.subheader("🏢 Distribusi Departemen")
+            dept_counts = pd.Series(repo.count_by('department'))
+            st.bar_chart(dept_counts)
+        
+        # Response time analytics
+        st.markdown("---")
+        st.subheader("⏱️ Analisis Waktu Respons")
+        
+        resolution_time = analytics.resolution_hours()
+        
+        if not resolution_time.empty:
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                avg_time = resolution_time.mean()
+                st.metric("Rata-rata Waktu Resolusi", f"{avg_time:.1f} jam")
+            
+            with col2:
+                min_time = resolution_time.min()
+                st.metric("Tercepat", f"{min_time:.1f} jam")
+            
+            with col3:
+                max_time = resolution_time.max()
+                st.metric("Terlama", f"{max_time:.1f} jam")
+            
+            percentiles = analytics.resolution_percentiles()
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("P50 Resolusi", f"{percentiles[0.5]:.1f} jam")
+            
+            with col2:
+                st.metric("P90 Resolusi", f"{percentiles[0.9]:.1f} jam")
+            
+            with col3:
+                st.metric("P99 Resolusi", f"{percentiles[0.99]:.1f} jam")
+        
+        first_response = analytics.time_to_first_response()
+        
+        if not first_response.empty:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.metric("Median Respons Pertama", f"{first_response.median():.1f} jam")
+            
+            with col2:
+                st.metric("P90 Respons Pertama", f"{first_response.quantile(0.9):.1f} jam")
+        
+        time_in_status = analytics.time_in_status()
+        
+        if not time_in_status.empty:
+            st.markdown("**Rata-rata Waktu di Setiap Status (jam)**")
+            st.bar_chart(time_in_status.mean())
+        
+        # Export data
+        st.markdown("---")
+        st.subheader("📥 Export Data")
+        
+        # File export hanya dibuat saat tombol ditekan, per potongan tiket
+        with st.form("export_form"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                format_by_label = {label: fmt for fmt, (label, _, _) in EXPORT_FORMATS.items()}
+                export_format = format_by_label[st.selectbox("Format", list(format_by_label))]
+            
+            with col2:
+                export_statuses = st.multiselect(
+                    "Status",
+                    STATUSES,
+                    default=STATUSES
+                )
+            
+            with col3:
+                export_dates = st.date_input("Tanggal Dibuat", value=[], help="Kosongkan untuk semua tanggal")
+            
+            prepare = st.form_submit_button("⚙️ Siapkan File Export", use_container_width=True)
+        
+        if prepare:
+            start_date = export_dates[0] if len(export_dates) > 0 else None
+            end_date = export_dates[-1] if len(export_dates) > 0 else None
+            buffer = io.BytesIO()
+            with st.spinner("Menyiapkan file export..."), span("export"):
+                write_export(
+                    repo, buffer, export_format,
+                    statuses=export_statuses, start_date=start_date, end_date=end_date
+                )
+            label, extension, mime = EXPORT_FORMATS[export_format]
+            st.download_button(
+                label=f"📥 Download {label}",
+                data=buffer,
+                file_name=f"tickets_export.{extension}",
+                mime=mime,
+                use_container_width=True
+            )
+    else:
+        st.info("📭 Belum ada data untuk analisis. Buat tiket terlebih dahulu!")
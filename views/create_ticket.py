@@ -0,0 +1,143 @@
+"""Halaman "Buat Tiket Baru": form tiket, lampiran, dan import massal.
+
+Halaman ini paling sering dibuka, jadi hanya memuat modul ringan; importer
+(dan pandas) baru di-import saat import massal dijalankan.
+"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from attachments import (
+    ATTACHMENT_TYPES, MAX_ATTACHMENT_SIZE, AttachmentError, format_size, store_upload
+)
+from models import CATEGORIES, DEPARTMENTS, PRIORITIES, TIMESTAMP_FORMAT
+from profiler import span
+from repository import DuplicateTicketError
+
+
+def render(repo):
+    st.title("✏️ Buat Tiket Support Baru")
+    
+    with st.form("new_ticket_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            name = st.text_input("Nama Anda *", placeholder="Masukkan nama lengkap")
+            email = st.text_input("Email *", placeholder="email@example.com")
+            phone = st.text_input("No. Telepon", placeholder="+62 812-3456-7890")
+        
+        with col2:
+            category = st.selectbox(
+                "Kategori *",
+                CATEGORIES
+            )
+            priority = st.selectbox(
+                "Prioritas *",
+                PRIORITIES
+            )
+            department = st.selectbox(
+                "Departemen Tujuan",
+                DEPARTMENTS
+            )
+        
+        subject = st.text_input("Subjek Permasalahan *", placeholder="Jelaskan masalah Anda secara singkat")
+        description = st.text_area(
+            "Deskripsi Detail *",
+            placeholder="Jelaskan masalah Anda secara detail...",
+            height=150
+        )
+        
+        attachment = st.file_uploader(
+            "Lampiran (opsional)", type=ATTACHMENT_TYPES,
+            help=f"Maksimal {format_size(MAX_ATTACHMENT_SIZE)}"
+        )
+        
+        st.markdown("**_* = wajib diisi_**")
+        
+        submitted = st.form_submit_button("🚀 Kirim Tiket", use_container_width=True)
+        
+        if submitted:
+            if not name or not email or not subject or not description:
+                st.error("❌ Mohon lengkapi semua field yang wajib diisi!")
+            elif attachment is not None and attachment.size > MAX_ATTACHMENT_SIZE:
+                st.error(f"❌ Lampiran melebihi batas {format_size(MAX_ATTACHMENT_SIZE)}")
+            else:
+                attachments = []
+                if attachment is not None:
+                    # Disalin ke penyimpanan lampiran per potongan; tiket hanya menyimpan referensinya
+                    try:
+                        with span("store_attachment"):
+                            attachments.append(store_upload(attachment, attachment.name))
+                    except AttachmentError as e:
+                        st.error(f"❌ {e}")
+                        st.stop()
+                new_ticket = {
+                    'id': repo.allocate_ticket_id(),
+                    'name': name,
+                    'email': email,
+                    'phone': phone,
+                    'category': category,
+                    'priority': priority,
+                    'department': department,
+                    'subject': subject,
+                    'description': description,
+                    'status': 'Open',
+                    'created_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+                    'updated_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+                    'assigned_to': None,
+                    'attachments': attachments
+                }
+                
+                with span("save_create"):
+                    try:
+                        repo.create(new_ticket)
+                    except DuplicateTicketError as e:
+                        st.error(f"❌ {e}. Silakan kirim ulang formulir.")
+                        st.stop()
+                
+                st.success(f"✅ Tiket berhasil dibuat! ID Tiket: **{new_ticket['id']}**")
+                st.balloons()
+                
+                with st.expander("📄 Detail Tiket"):
+                    st.json(new_ticket)
+    
+    # Import massal
+    st.markdown("---")
+    st.subheader("📦 Import Tiket Massal")
+    st.caption(
+        "Upload file JSON (array, seperti tickets-data-sample.json), NDJSON, atau CSV. "
+        "Tiket tanpa ID TKT-xxx akan mendapat ID baru."
+    )
+    
+    import_file = st.file_uploader("File tiket", type=['json', 'ndjson', 'jsonl', 'csv'], key="import_file")
+    
+    if import_file is not None and st.button("📥 Import Tiket", use_container_width=True):
+        # Hanya dimuat saat import dijalankan, bukan setiap kali form dibuka
+        import pandas as pd
+        from importer import ImportFormatError, import_upload
+        
+        progress = st.empty()
+        
+        def show_progress(report):
+            progress.info(f"⏳ {report.read} record diproses ({report.throughput:,.0f} record/detik)")
+        
+        try:
+            with span("import"):
+                report = import_upload(repo, import_file, on_batch=show_progress)
+        except ImportFormatError as e:
+            progress.empty()
+            st.error(f"❌ File tidak dapat dibaca: {e}")
+        else:
+            progress.empty()
+            st.success(f"✅ {report.summary()}")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Diimport", report.imported)
+            col2.metric("Duplikat", report.duplicates)
+            col3.metric("Ditolak", report.rejected)
+            col4.metric("Record/detik", f"{report.throughput:,.0f}")
+            
+            if report.rejects:
+                st.markdown("**Record yang ditolak**")
+                st.dataframe(pd.DataFrame(report.rejects), use_container_width=True, hide_index=True)
@@ -0,0 +1,151 @@
+"""Halaman "Dashboard": ringkasan jumlah tiket, tiket terbaru, dan distribusi"""
+
+import pandas as pd
+import streamlit as st
+
+from models import STATUSES
+from profiler import span
+from resources import get_sla_scheduler
+from sla import STATE_AT_RISK, STATE_BREACHED
+
+# Jumlah tiket maksimum yang ditampilkan di antrean berisiko SLA
+SLA_QUEUE_LIMIT = 10
+
+
+def _format_remaining(seconds):
+    """Sisa waktu ke tenggat, misal 1 jam 20 mnt atau lewat 3 hari 2 jam"""
+    prefix = "lewat " if seconds < 0 else ""
+    minutes = abs(seconds) // 60
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{prefix}{days} hari {hours} jam"
+    if hours:
+        return f"{prefix}{hours} jam {minutes} mnt"
+    return f"{prefix}{minutes} mnt"
+
+
+def _render_sla_queue(repo):
+    st.subheader("⏰ Antrean Berisiko SLA")
+    scheduler = get_sla_scheduler()
+    if not scheduler.ready:
+        st.info("Pemantauan SLA sedang dimuat...")
+        return
+    
+    with span("sla_queue"):
+        counts = scheduler.counts()
+        queue = scheduler.at_risk(SLA_QUEUE_LIMIT)
+        tickets = {ticket['id']: ticket for ticket in repo.get_many([entry['id'] for entry in queue])}
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Lewat SLA", counts[STATE_BREACHED])
+    col2.metric("Mendekati Tenggat", counts[STATE_AT_RISK])
+    col3.metric("Tiket Aktif Dipantau", counts['tracked'])
+    
+    rows = []
+    for entry in queue:
+        ticket = tickets.get(entry['id'])
+        if ticket is None:
+            continue
+        rows.append({
+            'ID': ticket['id'],
+            'Subjek': ticket['subject'],
+            'Prioritas': ticket['priority'],
+            'Kategori': ticket['category'],
+            'Status': ticket['status'],
+            'Tenggat': entry['deadline'],
+            'Sisa Waktu': _format_remaining(entry['remaining_seconds']),
+            'SLA': "🔴 Lewat" if entry['state'] == STATE_BREACHED else "🟠 Berisiko",
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    else:
+        st.success("✅ Tidak ada tiket aktif yang mendekati atau melewati tenggat SLA")
+
+
+def render(repo):
+    st.title("🚨 Dashboard Support Tickets")
+    
+    with span("aggregate_counts"):
+        total_tickets = repo.count()
+        status_counts = repo.count_by('status')
+    
+    # Metrics Row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+        st.metric("Total Tiket", total_tickets)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        open_count = status_counts.get('Open', 0)
+        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+        st.metric("Terbuka", open_count)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        progress_count = status_counts.get('In Progress', 0)
+        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+        st.metric("Dalam Proses", progress_count)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col4:
+        resolved_count = status_counts.get('Resolved', 0)
+        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+        st.metric("Selesai", resolved_count)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    _render_sla_queue(repo)
+    
+    st.markdown("---")
+    
+    # Recent Tickets
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader("📋 Tiket Terbaru")
+        if total_tickets:
+            recent_filter = st.selectbox(
+                "Tampilkan",
+                ["Semua"]
+                + [f"Status: {status}" for status in STATUSES]
+                + [f"Prioritas: {priority}" for priority in ["High", "Medium", "Low"]],
+                label_visibility="collapsed"
+            )
+            with span("recent_tickets"):
+                if recent_filter == "Semua":
+                    recent_tickets = repo.recent(5)
+                else:
+                    label, value = recent_filter.split(": ", 1)
+                    field = 'status' if label == "Status" else 'priority'
+                    recent_tickets = repo.recent(5, field, value)
+            
+            for ticket in recent_tickets:
+                priority_class = f"ticket-{ticket['priority'].lower()}"
+                status_class = f"status-{ticket['status'].lower().replace(' ', '')}"
+                
+                st.markdown(f"""
+                <div class="ticket-card {priority_class}">
+                    <h4>{ticket['id']} - {ticket['subject']}</h4>
+                    <p><strong>Kategori:</strong> {ticket['category']} | <strong>Prioritas:</strong> {ticket['priority']}</p>
+                    <p><strong>Status:</strong> <span class="{status_class}">{ticket['status']}</span></p>
+                    <p><strong>Dibuat:</strong> {ticket['created_at']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.info("Belum ada tiket yang dibuat.")
+    
+    with col2:
+        st.subheader("📈 Distribusi Prioritas")
+        if total_tickets:
+            priority_counts = pd.Series(repo.count_by('priority'))
+            st.bar_chart(priority_counts)
+        else:
+            st.info("Tidak ada data untuk ditampilkan")
+        
+        st.subheader("🔄 Distribusi Status")
+        if total_tickets:
+            st.bar_chart(pd.Series(status_counts))
@@ -0,0 +1,81 @@
+"""Halaman "Cari Tiket": pencarian berdasarkan ID, email, atau kata kunci"""
+
+import streamlit as st
+
+from profiler import span
+
+# Jumlah maksimum hasil pencarian kata kunci yang ditampilkan
+SEARCH_RESULT_LIMIT = 50
+
+
+def render(repo):
+    st.title("🔍 Cari Tiket")
+    
+    search_method = st.radio("Cari berdasarkan:", ["ID Tiket", "Email", "Kata Kunci"])
+    
+    if search_method == "ID Tiket":
+        ticket_id = st.text_input("Masukkan ID Tiket", placeholder="TKT-001")
+        
+        if st.button("🔍 Cari"):
+            with span("search_id"):
+                ticket = repo.get(ticket_id)
+            if ticket:
+                st.success(f"✅ Tiket ditemukan!")
+                
+                with st.container():
+                    st.markdown(f"### 🎫 {ticket['id']} - {ticket['subject']}")
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown(f"**Nama:** {ticket['name']}")
+                        st.markdown(f"**Email:** {ticket['email']}")
+                        st.markdown(f"**Kategori:** {ticket['category']}")
+                    
+                    with col2:
+                        st.markdown(f"**Prioritas:** {ticket['priority']}")
+                        st.markdown(f"**Status:** {ticket['status']}")
+                        st.markdown(f"**Dibuat:** {ticket['created_at']}")
+                    
+                    st.markdown("**Deskripsi:**")
+                    st.write(ticket['description'])
+            else:
+                st.error("❌ Tiket tidak ditemukan!")
+    
+    elif search_method == "Email":
+        email = st.text_input(
+            "Masukkan Email",
+            placeholder="email@example.com",
+            help="Awal alamat email, atau @domain untuk semua email di domain tersebut"
+        )
+        
+        if st.button("🔍 Cari"):
+            with span("search_email"):
+                results = repo.find_by_email(email)
+            
+            if results:
+                st.success(f"✅ Ditemukan {len(results)} tiket dengan email tersebut")
+                
+                for ticket in results:
+                    with st.expander(f"{ticket['id']} - {ticket['subject']}"):
+                        st.json(dict(ticket))
+            else:
+                st.error("❌ Tidak ada tiket dengan email tersebut!")
+    
+    else:  # Kata Kunci
+        keyword = st.text_input("Masukkan Kata Kunci", placeholder="masalah login")
+        
+        if st.button("🔍 Cari"):
+            with span("search_keyword"):
+                results = repo.search_keyword(keyword, limit=SEARCH_RESULT_LIMIT)
+            
+            if results:
+                if len(results) == SEARCH_RESULT_LIMIT:
+                    st.success(f"✅ Menampilkan {SEARCH_RESULT_LIMIT} tiket paling relevan")
+                else:
+                    st.success(f"✅ Ditemukan {len(results)} tiket")
+                
+                for ticket in results:
+                    with st.expander(f"{ticket['id']} - {ticket['subject']}"):
+                        st.json(dict(ticket))
+            else:
+                st.error("❌ Tidak ada tiket yang cocok!")
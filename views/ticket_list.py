@@ -0,0 +1,225 @@
+"""Halaman "Daftar Tiket": filter, keyset pagination, update status, dan komentar"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from attachments import format_size, read_attachment, thumbnail_path
+from models import CATEGORIES, PRIORITIES, STATUSES, TIMESTAMP_FORMAT
+from profiler import span
+from repository import COMMENT_PAGE_SIZE, ConflictError, creation_order_key
+
+# Pilihan jumlah tiket per halaman
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+
+def render(repo):
+    st.title("📋 Daftar Semua Tiket")
+    
+    total_tickets = repo.count()
+    
+    if total_tickets:
+        # Filter options
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            status_filter = st.multiselect(
+                "Filter Status",
+                STATUSES,
+                default=["Open", "In Progress"]
+            )
+        
+        with col2:
+            priority_filter = st.multiselect(
+                "Filter Prioritas",
+                PRIORITIES,
+                default=PRIORITIES
+            )
+        
+        with col3:
+            category_filter = st.multiselect(
+                "Filter Kategori",
+                CATEGORIES,
+                default=CATEGORIES
+            )
+        
+        page_size = st.selectbox("Tiket per halaman", PAGE_SIZE_OPTIONS, index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE))
+        
+        # Kembali ke halaman pertama jika filter atau ukuran halaman berubah
+        filter_key = (tuple(status_filter), tuple(priority_filter), tuple(category_filter), page_size)
+        if st.session_state.get('list_filter_key') != filter_key:
+            st.session_state.list_filter_key = filter_key
+            st.session_state.list_cursors = [None]
+        
+        # Keyset pagination: cursor = (created_at, nomor ID) tiket terakhir halaman sebelumnya
+        cursors = st.session_state.list_cursors
+        with span("filter"):
+            filtered_count = repo.count_filtered(status_filter, priority_filter, category_filter)
+            page_tickets = repo.filter_page(
+                status_filter, priority_filter, category_filter,
+                cursor=cursors[-1], limit=page_size + 1
+            )
+        has_next = len(page_tickets) > page_size
+        page_tickets = page_tickets[:page_size]
+        
+        st.markdown(f"**Menampilkan {len(page_tickets)} dari {filtered_count} tiket terfilter ({total_tickets} total)**")
+        st.markdown("---")
+        
+        # Display tickets
+        for ticket in page_tickets:
+            selected = st.session_state.get('selected_ticket') == ticket['id']
+            with st.expander(f"🎫 {ticket['id']} - {ticket['subject']} ({ticket['status']})", expanded=selected):
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    st.markdown(f"**Nama:** {ticket['name']}")
+                    st.markdown(f"**Email:** {ticket['email']}")
+                    st.markdown(f"**Kategori:** {ticket['category']}")
+                    st.markdown(f"**Deskripsi:**")
+                    st.write(ticket['description'])
+                    
+                    for item in ticket.get('attachments') or []:
+                        st.markdown(f"📎 **{item['name']}** ({format_size(item['size'])})")
+                        thumbnail = thumbnail_path(item)
+                        if thumbnail:
+                            st.image(thumbnail)
+                        # File dibaca dari disk hanya saat pengguna meminta unduhan
+                        download_key = f"download_{ticket['id']}_{item['sha256']}"
+                        if st.session_state.get(download_key):
+                            st.download_button(
+                                f"⬇️ Download {item['name']}", read_attachment(item['sha256']),
+                                file_name=item['name'], mime=item['type'], key=f"{download_key}_button"
+                            )
+                            # Tombol download hanya untuk rerun ini; rerun berikutnya tidak membaca file lagi
+                            # (Streamlit tetap menyajikan file download satu siklus setelah tombolnya hilang)
+                            del st.session_state[download_key]
+                        elif st.button(f"📥 Siapkan {item['name']}", key=f"{download_key}_prepare"):
+                            st.session_state[download_key] = True
+                            st.rerun()
+                
+                with col2:
+                    st.markdown(f"**Prioritas:** {ticket['priority']}")
+                    st.markdown(f"**Status:** {ticket['status']}")
+                    st.markdown(f"**Dibuat:** {ticket['created_at']}")
+                    st.markdown(f"**Diupdate:** {ticket['updated_at']}")
+                
+                st.markdown("---")
+                
+                # Widget update dan komentar hanya dibuat untuk tiket yang sedang dikelola
+                if not selected:
+                    if st.button("✏️ Kelola Tiket", key=f"select_{ticket['id']}"):
+                        st.session_state.selected_ticket = ticket['id']
+                        # Versi yang dilihat pengguna; dipakai untuk deteksi konflik saat menyimpan
+                        st.session_state.selected_version = ticket['version']
+                        st.rerun()
+                    continue
+                
+                if st.button("✖️ Tutup", key=f"close_{ticket['id']}"):
+                    st.session_state.selected_ticket = None
+                    st.rerun()
+                
+                seen_version = st.session_state.get('selected_version', ticket['version'])
+                if ticket['version'] != seen_version:
+                    st.warning("⚠️ Tiket ini sudah diubah oleh pengguna lain sejak Anda membukanya. Data di atas adalah versi terbaru.")
+                    if st.button("🔄 Pakai Versi Terbaru", key=f"reload_{ticket['id']}"):
+                        st.session_state.selected_version = ticket['version']
+                        for key in (f"status_{ticket['id']}", f"assign_{ticket['id']}"):
+                            st.session_state.pop(key, None)
+                        st.rerun()
+                
+                # Update status
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    new_status = st.selectbox(
+                        "Update Status",
+                        STATUSES,
+                        index=STATUSES.index(ticket['status']),
+                        key=f"status_{ticket['id']}"
+                    )
+                
+                with col2:
+                    assigned_to = st.text_input(
+                        "Assign ke",
+                        value=ticket.get('assigned_to', '') or '',
+                        key=f"assign_{ticket['id']}"
+                    )
+                
+                with col3:
+                    if st.button("💾 Simpan Update", key=f"save_{ticket['id']}"):
+                        changes = {
+                            'status': new_status,
+                            'assigned_to': assigned_to if assigned_to else None,
+                            'updated_at': datetime.now().strftime(TIMESTAMP_FORMAT)
+                        }
+                        try:
+                            with span("save_update"):
+                                version = repo.update(ticket['id'], changes, expected_version=seen_version)
+                        except ConflictError:
+                            st.error("❌ Gagal menyimpan: tiket sudah diubah oleh pengguna lain. Periksa data terbaru lalu simpan ulang.")
+                        else:
+                            st.session_state.selected_version = version
+                            st.success("✅ Tiket berhasil diupdate!")
+                            st.rerun()
+                
+                # Comments section
+                st.markdown("### 💬 Komentar")
+                
+                # Komentar dibaca dari penyimpanan hanya saat bagian ini dibuka, per halaman
+                comment_count = repo.count_comments(ticket['id'])
+                if st.toggle(f"Tampilkan {comment_count} komentar", key=f"show_comments_{ticket['id']}"):
+                    shown_key = f"comments_shown_{ticket['id']}"
+                    shown = st.session_state.get(shown_key, COMMENT_PAGE_SIZE)
+                    with span("load_comments"):
+                        comments = repo.comments(ticket['id'], 0, shown)
+                    for comment in comments:
+                        st.markdown(f"""
+                        <div style='background-color: #e9ecef; padding: 10px; border-radius: 5px; margin: 5px 0;'>
+                            <strong>{comment['author']}</strong> - <small>{comment['timestamp']}</small>
+                            <p>{comment['text']}</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    if comment_count > shown:
+                        if st.button(f"Muat komentar berikutnya ({comment_count - shown} lagi)", key=f"more_comments_{ticket['id']}"):
+                            st.session_state[shown_key] = shown + COMMENT_PAGE_SIZE
+                            st.rerun()
+                
+                new_comment = st.text_area("Tambah komentar", key=f"comment_{ticket['id']}")
+                comment_author = st.text_input("Nama Anda", key=f"author_{ticket['id']}")
+                
+                if st.button("➕ Tambah Komentar", key=f"add_comment_{ticket['id']}"):
+                    if new_comment and comment_author:
+                        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+                        comment = {
+                            'author': comment_author,
+                            'text': new_comment,
+                            'timestamp': now
+                        }
+                        try:
+                            with span("save_comment"):
+                                version = repo.add_comment(ticket['id'], comment, now, expected_version=seen_version)
+                        except ConflictError:
+                            st.error("❌ Komentar belum disimpan: tiket sudah diubah oleh pengguna lain. Baca perubahan terbaru lalu kirim ulang.")
+                        else:
+                            st.session_state.selected_version = version
+                            st.success("✅ Komentar ditambahkan!")
+                            st.rerun()
+        
+        # Navigasi halaman
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col1:
+            if len(cursors) > 1 and st.button("⬅️ Sebelumnya", use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        
+        with col2:
+            st.markdown(f"<div style='text-align: center;'>Halaman {len(cursors)}</div>", unsafe_allow_html=True)
+        
+        with col3:
+            if has_next and st.button("Berikutnya ➡️", use_container_width=True):
+                cursors.append(creation_order_key(page_tickets[-1]))
+                st.rerun()
+    else:
+        st.info("📭 Belum ada tiket yang dibuat. Silakan buat tiket baru!")